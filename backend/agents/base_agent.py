@@ -1,18 +1,35 @@
 """
 Base agent class for property analysis.
 This class provides core functionality that can be inherited by specific agent types.
+
+Prompt templates and personas are read once at import time and shared by every agent instance.
 """
 
 import os
 import json
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterator, Optional, List, Mapping
 import google.generativeai as genai
 import logging
 from pathlib import Path
+from types import MappingProxyType
 
 logger = logging.getLogger(__name__)
 
+PROMPTS_DIR = Path(__file__).parent / "prompts"
+PERSONAS_DIR = Path(__file__).parent / "personas"
+
+def _read_files(directory: Path) -> Mapping[str, str]:
+    """Read every file in a directory into a read-only mapping of file name to contents."""
+    return MappingProxyType({
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(directory.iterdir())
+        if path.is_file()
+    })
+
+PROMPTS: Mapping[str, str] = _read_files(PROMPTS_DIR)
+PERSONAS: Mapping[str, str] = _read_files(PERSONAS_DIR)
+
 class BaseAgent:
     """Base class for property analysis agents."""
     
@@ -20,14 +37,14 @@ class BaseAgent:
         self.agent_type = agent_type
         self.agent_name = agent_name
         self.logger = logging.getLogger(f"{agent_type}_{agent_name}")
-        self.template_dir = Path(__file__).parent / "prompts"
+        self.template_dir = PROMPTS_DIR
         self.analysis_template = self._load_template("analysis_template.json")
         self.analysis_prompt = self._load_template("analysis_prompt.txt")
+        self.quick_summary_prompt = self._load_template("quick_summary_prompt.txt")
         self.response_prompt = self._load_template("response_prompt.txt")
+        self.inspection_checklist = self._load_template("inspection_checklist.txt")
+        self.json_template = self.analysis_template
         self._setup_gemini()
-        self._load_prompts()
-        self._load_inspection_checklist()
-        self._load_json_template()
     
     def _setup_gemini(self) -> None:
         """Set up the Gemini API with the provided key."""
@@ -42,58 +59,12 @@ class BaseAgent:
             self.logger.error(f"Failed to configure Gemini API: {str(e)}")
             raise
     
-    def _load_prompts(self) -> None:
-        """Load the analysis and quick summary prompts."""
-        try:
-            prompts_path = self.template_dir
-            
-            # Load analysis prompt
-            with open(prompts_path / 'analysis_prompt.txt', 'r') as f:
-                self.analysis_prompt = f.read()
-            
-            # Load quick summary prompt
-            with open(prompts_path / 'quick_summary_prompt.txt', 'r') as f:
-                self.quick_summary_prompt = f.read()
-            
-            # Load response prompt
-            with open(prompts_path / 'response_prompt.txt', 'r') as f:
-                self.response_prompt = f.read()
-            
-            self.logger.info("Prompts loaded successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to load prompts: {str(e)}")
-            raise
-    
-    def _load_inspection_checklist(self) -> None:
-        """Load the inspection checklist."""
-        try:
-            checklist_path = self.template_dir / 'inspection_checklist.txt'
-            with open(checklist_path, 'r') as f:
-                self.inspection_checklist = f.read()
-            self.logger.info("Inspection checklist loaded successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to load inspection checklist: {str(e)}")
-            raise
-    
-    def _load_json_template(self) -> None:
-        """Load the JSON template for structured responses."""
-        try:
-            template_path = self.template_dir / 'analysis_template.json'
-            with open(template_path, 'r') as f:
-                self.json_template = f.read()
-            self.logger.info("JSON template loaded successfully")
-        except Exception as e:
-            self.logger.error(f"Failed to load JSON template: {str(e)}")
-            raise
-    
     def _load_template(self, filename: str) -> str:
-        """Load a template file from the prompts directory."""
-        template_path = self.template_dir / filename
+        """Get a template from the prompts directory."""
         try:
-            with open(template_path, 'r') as f:
-                return f.read()
-        except Exception as e:
-            self.logger.error(f"Error loading template {filename}: {str(e)}")
+            return PROMPTS[filename]
+        except KeyError:
+            self.logger.error(f"Error loading template {filename}: not found in {PROMPTS_DIR}")
             raise
     
     def validate_property_data(self, property_data: Dict[str, Any]) -> bool:
@@ -147,6 +118,42 @@ class BaseAgent:
                 formatted_analysis.append(str(content))
         return "\n".join(formatted_analysis)
 
+    def _build_prompt(
+        self,
+        property_data: Dict[str, Any],
+        distance_info: Optional[Dict[str, Any]],
+        chat_history: Optional[List[Dict[str, Any]]],
+        current_question: Optional[str],
+        persona_prompt: Optional[str]
+    ) -> str:
+        """Build the prompt for an initial analysis or a follow-up question."""
+        self.logger.info(f"Starting property analysis for {property_data.get('address', 'Unknown Address')}")
+        
+        # If this is a follow-up question, use the response prompt
+        if current_question and chat_history:
+            self.logger.info("Processing follow-up question")
+            prompt = self.response_prompt.format(
+                agent_name=self.agent_name,
+                agent_type=self.agent_type,
+                previous_analysis=self._format_previous_analysis(chat_history[-1].get('analysis', {})),
+                chat_history=self._format_chat_history(chat_history[:-1]),  # Exclude the last message (analysis)
+                current_question=current_question
+            )
+        else:
+            # Initial analysis
+            self.logger.info("Performing initial property analysis")
+            prompt = self.analysis_prompt.format(
+                property_data=json.dumps(property_data, indent=2),
+                distance_info=json.dumps(distance_info, indent=2) if distance_info else "No distance information available",
+                json_template=self.json_template
+            )
+
+        self.logger.info("Preparing prompt")
+        # Add persona prompt if provided
+        if persona_prompt:
+            prompt = f"{persona_prompt}\n\n{prompt}"
+        return prompt
+
     def analyze_property(
         self, 
         property_data: Dict[str, Any], 
@@ -169,31 +176,9 @@ class BaseAgent:
             Dictionary containing the analysis results
         """
         try:
-            self.logger.info(f"Starting property analysis for {property_data.get('address', 'Unknown Address')}")
-            
-            # If this is a follow-up question, use the response prompt
-            if current_question and chat_history:
-                self.logger.info("Processing follow-up question")
-                prompt = self.response_prompt.format(
-                    agent_name=self.agent_name,
-                    agent_type=self.agent_type,
-                    previous_analysis=self._format_previous_analysis(chat_history[-1].get('analysis', {})),
-                    chat_history=self._format_chat_history(chat_history[:-1]),  # Exclude the last message (analysis)
-                    current_question=current_question
-                )
-            else:
-                # Initial analysis
-                self.logger.info("Performing initial property analysis")
-                prompt = self.analysis_prompt.format(
-                    property_data=json.dumps(property_data, indent=2),
-                    distance_info=json.dumps(distance_info, indent=2) if distance_info else "No distance information available",
-                    json_template=self.json_template
-                )
-
-            self.logger.info("Preparing prompt")
-            # Add persona prompt if provided
-            if persona_prompt:
-                prompt = f"{persona_prompt}\n\n{prompt}"
+            prompt = self._build_prompt(
+                property_data, distance_info, chat_history, current_question, persona_prompt
+            )
 
             # Get response from the agent
             response = self._get_agent_response(prompt)
@@ -219,8 +204,36 @@ class BaseAgent:
             self.logger.error(f"Error in analyze_property: {str(e)}")
             raise
 
+    def stream_analysis(
+        self, 
+        property_data: Dict[str, Any], 
+        distance_info: Optional[Dict[str, Any]] = None, 
+        chat_history: Optional[List[Dict[str, Any]]] = None, 
+        current_question: Optional[str] = None,
+        persona_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Analyze a property, yielding the raw response text as the model generates it.
+        
+        Takes the same arguments as analyze_property. The streamed text is not parsed, so
+        an initial analysis arrives as the model's JSON text.
+        
+        Yields:
+            Chunks of the response text
+        """
+        prompt = self._build_prompt(
+            property_data, distance_info, chat_history, current_question, persona_prompt
+        )
+        yield from self._stream_agent_response(prompt)
+
     def _get_agent_response(self, prompt: str) -> str:
         """
         Get response from the agent. This method should be implemented by subclasses.
         """
-        raise NotImplementedError("Subclasses must implement _get_agent_response")
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement _get_agent_response")
+
+    def _stream_agent_response(self, prompt: str) -> Iterator[str]:
+        """
+        Stream the response from the agent. This method should be implemented by subclasses.
+        """
+        raise NotImplementedError("Subclasses must implement _stream_agent_response")
\ No newline at end of file
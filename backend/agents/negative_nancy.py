@@ -3,15 +3,38 @@ NegativeNancy agent class that inherits from BaseAgent.
 This agent provides a consistently negative perspective on property analysis.
 """
 
-import os
-from typing import Dict, Any, Optional, List
-from .base_agent import BaseAgent
+from typing import Dict, Any, Iterable, Iterator, Optional, List
+from .base_agent import PERSONAS, PERSONAS_DIR, BaseAgent
 import logging
-import google.generativeai as genai
-import json
 
 logger = logging.getLogger(__name__)
 
+_JSON_FENCE = '```json'
+
+def _strip_code_fences(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Remove markdown code block markers from streamed text, as _get_agent_response does
+    for a complete response.
+    
+    Text that could be the start of a marker split across chunks is held back until the
+    next chunk shows whether it is one.
+    """
+    pending = ""
+    for text in chunks:
+        pending += text
+        # Longest ending of the text that is an incomplete "```json" marker
+        held = next(
+            (n for n in range(min(len(pending), len(_JSON_FENCE) - 1), 0, -1) if _JSON_FENCE.startswith(pending[-n:])),
+            0
+        )
+        ready = pending[:len(pending) - held].replace(_JSON_FENCE, '').replace('```', '')
+        pending = pending[len(pending) - held:]
+        if ready:
+            yield ready
+    pending = pending.replace('```', '')
+    if pending:
+        yield pending
+
 class NegativeNancy(BaseAgent):
     """Agent that provides a negative perspective on property analysis."""
     
@@ -22,20 +45,6 @@ class NegativeNancy(BaseAgent):
         self.persona_file = 'negative_nancy.txt'
         self.persona = self._load_persona()
 
-    def _setup_gemini(self) -> None:
-        """Set up the Gemini API with the provided key."""
-        try:
-            if self.api_key:
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-2.0-flash')
-                self.logger.info("Gemini API configured successfully")
-            else:
-                self.logger.warning("API key not set, Gemini API will not be available")
-        except Exception as e:
-            self.logger.error(f"Failed to configure Gemini API: {str(e)}")
-            raise
-        
-
     def _get_agent_response(self, prompt: str) -> str:
         """
         Get response from Negative Nancy using the Gemini API.
@@ -62,17 +71,44 @@ class NegativeNancy(BaseAgent):
             self.logger.error(f"Failed to get response from Gemini API: {str(e)}")
             raise
     
+    def _stream_agent_response(self, prompt: str) -> Iterator[str]:
+        """
+        Stream the response from Negative Nancy as the Gemini API generates it.
+        
+        Args:
+            prompt: The formatted prompt to send to the model
+            
+        Yields:
+            Chunks of the model's response text
+        """
+        try:
+            chunks = (self._chunk_text(chunk) for chunk in self.model.generate_content(prompt, stream=True))
+            yield from _strip_code_fences(chunks)
+        except Exception as e:
+            self.logger.error(f"Failed to stream response from Gemini API: {str(e)}")
+            raise
+    
+    @staticmethod
+    def _chunk_text(chunk: Any) -> str:
+        """
+        Get the text of a streamed response chunk.
+        
+        Unlike chunk.text, this does not raise for chunks without text parts, such as
+        safety-blocked or finish-only chunks; those give an empty string.
+        """
+        candidates = getattr(chunk, "candidates", None) or []
+        if not candidates or candidates[0].content is None:
+            return ""
+        return "".join(getattr(part, "text", "") or "" for part in candidates[0].content.parts)
+    
     def _load_persona(self) -> str:
-        """Load the persona definition from the personas folder."""
+        """Get the persona definition loaded from the personas folder."""
         try:
-            persona_path = os.path.join(os.path.dirname(__file__), 'personas', self.persona_file)
-            print(f"Loading persona from {persona_path}")
-            with open(persona_path, 'r') as f:
-                persona = f.read().strip()
+            persona = PERSONAS[self.persona_file].strip()
             logger.info("Loaded NegativeNancy persona successfully")
             return persona
-        except Exception as e:
-            logger.error(f"Failed to load NegativeNancy persona: {str(e)}")
+        except KeyError:
+            logger.error(f"Failed to load NegativeNancy persona: {self.persona_file} not found in {PERSONAS_DIR}")
             raise
     
     def analyze_property(
@@ -96,6 +132,26 @@ class NegativeNancy(BaseAgent):
             persona_prompt=self.persona
         )
     
+    def stream_analysis(
+        self, 
+        property_data: Dict[str, Any], 
+        distance_info: Dict[str, Any], 
+        chat_history: Optional[List[Dict[str, Any]]] = None,
+        current_question: Optional[str] = None,
+        persona_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Stream a property analysis with NegativeNancy's perspective.
+        Overrides the base method to always include the negative persona.
+        """
+        return super().stream_analysis(
+            property_data=property_data,
+            distance_info=distance_info,
+            chat_history=chat_history,
+            current_question=current_question,
+            persona_prompt=self.persona
+        )
+    
     def get_quick_summary(self, property_data: Dict[str, Any]) -> str:
         """
         Generate a quick summary with NegativeNancy's perspective.
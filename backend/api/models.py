@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict
 from datetime import datetime
 from enum import Enum
@@ -9,18 +9,20 @@ class MessageRole(str, Enum):
     SYSTEM = "system"
 
 class Message(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     role: MessageRole
     content: str
     persona: Optional[str] = None  # Which persona is responding (if applicable)
-    timestamp: datetime = datetime.now()
+    timestamp: datetime = Field(default_factory=datetime.now)
 
 class ChatSession(BaseModel):
     session_id: str
     property_data: Dict
     distance_info: Optional[Dict] = None
     messages: List[Message] = []
-    created_at: datetime = datetime.now()
-    updated_at: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
 
 class ChatRequest(BaseModel):
     message: str
@@ -28,6 +30,8 @@ class ChatRequest(BaseModel):
     property_url: Optional[str] = None  # Required for new sessions
 
 class ChatResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     session_id: str
     messages: List[Message]
     property_data: Optional[Dict] = None
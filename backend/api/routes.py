@@ -4,32 +4,34 @@ This module provides endpoints for property analysis, distance calculations, and
 """
 
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
+import asyncio
 import os
+import re
+import secrets
 import logging
 from datetime import datetime
-from functools import lru_cache
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Logging is configured once by the application entry point (backend/main.py)
 logger = logging.getLogger(__name__)
 
 # Initialize router
 router = APIRouter(
     prefix="/api/v1",
     tags=["property-analysis"],
+    default_response_class=ORJSONResponse,
     responses={404: {"description": "Not found"}},
 )
 
 # Import services after router initialization to avoid circular imports
 from ..services.scraper import DomainScraper
 from ..services.map import DistanceCalculator
+from ..services.cache import PropertyCache
 from ..agents.negative_nancy import NegativeNancy
 from ..agents.base_agent import BaseAgent
+from ..pipeline import PropertyFetchError, analyze
 
 # TODO: Fix an issue where consecutive requests to the API are not being handled correctly.
 # Current hypothesis is that once initialized, the service manager is not being re-initialized or can't
@@ -43,6 +45,7 @@ class ServiceManager:
         self._scraper = None
         self._distance_calculator = None
         self._negative_nancy = None
+        self._cache = None
         self._lock = None  # Will be used for thread safety if needed
 
     @property
@@ -61,13 +64,21 @@ class ServiceManager:
             self._distance_calculator = DistanceCalculator(os.getenv("GOOGLE_MAP_API_KEY"))
         return self._distance_calculator
 
+    @property
+    def cache(self) -> PropertyCache:
+        """Lazy initialization of PropertyCache."""
+        if self._cache is None:
+            logger.info("Initializing PropertyCache")
+            self._cache = PropertyCache(os.getenv("REDIS_URL"))
+        return self._cache
+
     @property
     def negative_nancy(self) -> NegativeNancy:
         """Lazy initialization of NegativeNancy."""
         if self._negative_nancy is None:
             logger.info("Starting NegativeNancy initialization")
             api_key = os.getenv("GEMINI_API_KEY")
-            logger.info(f"API Key present: {'Yes' if api_key else 'No'}")
+            logger.info("API Key present: %s", 'Yes' if api_key else 'No')
             if not api_key:
                 logger.error("GEMINI_API_KEY environment variable is not set")
                 raise ValueError("GEMINI_API_KEY environment variable is not set")
@@ -76,17 +87,54 @@ class ServiceManager:
                 self._negative_nancy = NegativeNancy(api_key)
                 logger.info("NegativeNancy instance created successfully")
             except Exception as e:
-                logger.error(f"Failed to initialize NegativeNancy: {str(e)}", exc_info=True)
+                logger.error("Failed to initialize NegativeNancy: %s", e, exc_info=True)
                 raise
         return self._negative_nancy
 
-@lru_cache()
+    def warm_up(self) -> None:
+        """
+        Create the services up front so the first request does not pay their setup cost.
+        
+        The analysis agent needs GEMINI_API_KEY; without it the agent is left to be
+        created (and report the error) on first use.
+        """
+        _ = self.cache
+        _ = self.scraper
+        _ = self.distance_calculator
+        try:
+            _ = self.negative_nancy
+        except Exception as e:
+            logger.warning("NegativeNancy not pre-initialized: %s", e)
+
+    async def close(self) -> None:
+        """Release the resources held by any services that were started."""
+        if self._scraper is not None:
+            await self._scraper.close()
+        if self._distance_calculator is not None:
+            await self._distance_calculator.close()
+        if self._cache is not None:
+            await self._cache.close()
+
+# Services are created lazily, so the process-wide instance is cheap to build at import
+_service_manager = ServiceManager()
+
+# Listing URLs accepted by /initialize
+_DOMAIN_URL_RE = re.compile(r'^https://www\.domain\.com\.au/[\w\-/]+')
+
+# Maximum number of listings initialized at once by the batch endpoint
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+# Maximum number of URLs accepted in one batch request; larger batches are rejected with a 422
+MAX_BATCH_URLS = 20
+
+# Internal exception messages are only returned to clients outside production
+EXPOSE_ERRORS = os.getenv("ENV") != "production"
+
 def get_service_manager() -> ServiceManager:
     """
     Dependency injection function for ServiceManager.
-    Uses lru_cache to ensure we only create one instance per process.
+    Returns the single instance shared by every request in this process.
     """
-    return ServiceManager()
+    return _service_manager
 
 class PropertyInitializationRequest(BaseModel):
     """
@@ -97,6 +145,8 @@ class PropertyInitializationRequest(BaseModel):
         categories (Optional[List[str]]): List of categories for distance calculations
             (e.g., ["school", "train", "shopping"])
     """
+    model_config = ConfigDict(extra='ignore', str_strip_whitespace=True)
+
     url: str
     categories: Optional[List[str]] = None
 
@@ -110,13 +160,41 @@ class PropertyInitializationResponse(BaseModel):
         property_data (Optional[Dict]): Scraped property data if available
         distance_info (Optional[Dict]): Distance calculations if available
         error (Optional[str]): Error message if initialization failed
+    
+    Responses are built from server-produced data with model_construct, which skips validation.
     """
+    model_config = ConfigDict(frozen=True)
+
     session_id: str
     status: str
     property_data: Optional[Dict] = None
     distance_info: Optional[Dict] = None
     error: Optional[str] = None
 
+class BatchInitializationRequest(BaseModel):
+    """
+    Request model for initializing several properties at once.
+    
+    Attributes:
+        urls (List[str]): The Domain.com.au property URLs to analyze (1 to MAX_BATCH_URLS)
+        categories (Optional[List[str]]): List of categories for distance calculations
+    """
+    model_config = ConfigDict(extra='ignore', str_strip_whitespace=True)
+
+    urls: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_URLS)
+    categories: Optional[List[str]] = None
+
+class BatchInitializationResponse(BaseModel):
+    """
+    Response model for batch property initialization.
+    
+    Attributes:
+        results (List[PropertyInitializationResponse]): One result per requested URL, in request order
+    """
+    model_config = ConfigDict(frozen=True)
+
+    results: List[PropertyInitializationResponse]
+
 class AnalysisRequest(BaseModel):
     """
     Request model for property analysis.
@@ -128,6 +206,8 @@ class AnalysisRequest(BaseModel):
         chat_history (Optional[List[Dict[str, Any]]]): Chat history for the analysis
         current_question (Optional[str]): Current question for the analysis
     """
+    model_config = ConfigDict(extra='ignore', str_strip_whitespace=True)
+
     property_data: Dict
     distance_info: Optional[Dict] = None
     agent: str
@@ -140,16 +220,15 @@ class AnalysisResponse(BaseModel):
     
     Attributes:
         analysis (Dict): The analysis data from the agent, containing structured information
-        timestamp (str): When the analysis was performed
+        timestamp (str): When the analysis was performed, as an ISO 8601 string
         agent (str): The agent used for the analysis
     """
+    model_config = ConfigDict(frozen=True)
+
     analysis: Dict
     timestamp: str
     agent: str
 
-# In-memory storage for analysis sessions (replace with database in production)
-analysis_sessions: Dict[str, Dict] = {}
-
 @router.post("/initialize", response_model=PropertyInitializationResponse)
 async def initialize_property(
     request: PropertyInitializationRequest,
@@ -160,7 +239,7 @@ async def initialize_property(
     
     This endpoint:
     1. Creates a new analysis session
-    2. Scrapes property data
+    2. Scrapes property data (or reuses cached data for the URL)
     3. Calculates distances to points of interest
     4. Returns the complete analysis data
     
@@ -175,72 +254,60 @@ async def initialize_property(
         For invalid URLs, the endpoint will return a 200 status code with an error message
         in the response body rather than raising an HTTPException.
     """
+    cache = service_manager.cache
+    
+    # Random session IDs stay unique under concurrent requests, unlike timestamps
+    session_id = secrets.token_urlsafe(16)
+    
+    # Reject invalid URLs before any session state is written
+    if not _DOMAIN_URL_RE.match(request.url):
+        logger.warning("Invalid URL format for session %s: %s", session_id, request.url)
+        return PropertyInitializationResponse.model_construct(
+            session_id=session_id,
+            status="error",
+            error="Invalid URL format. URL must be from domain.com.au"
+        )
+    
     try:
-        # Generate session ID (using timestamp for simplicity)
-        session_id = str(datetime.now().timestamp())
-        logger.info(f"Starting property analysis for URL: {request.url}")
+        logger.debug("Starting property analysis for URL: %s", request.url)
         
         # Initialize session
-        analysis_sessions[session_id] = {
+        await cache.update_session(session_id, {
             "status": "initializing",
             "created_at": datetime.now().isoformat(),
             "url": request.url
-        }
+        })
         
-        # Validate URL format
-        if not request.url.startswith("https://www.domain.com.au/"):
-            error_msg = "Invalid URL format. URL must be from domain.com.au"
-            logger.warning(f"Invalid URL format for session {session_id}: {request.url}")
-            analysis_sessions[session_id].update({
-                "status": "error",
-                "error": error_msg
-            })
-            return PropertyInitializationResponse(
-                session_id=session_id,
-                status="error",
-                error=error_msg
+        try:
+            property_data, distance_info = await analyze(
+                request.url,
+                request.categories,
+                services=service_manager
             )
-        
-        # Scrape property data
-        logger.info(f"Starting property data scraping for session {session_id}")
-        property_data = service_manager.scraper.get_property_data(request.url)
-        
-        if not property_data:
+        except PropertyFetchError:
             error_msg = "Failed to fetch property data. The URL may be invalid or the property listing may no longer exist."
-            logger.warning(f"Failed to fetch property data for session {session_id}: {request.url}")
-            analysis_sessions[session_id].update({
+            logger.warning("Failed to fetch property data for session %s: %s", session_id, request.url)
+            await cache.update_session(session_id, {
                 "status": "error",
                 "error": error_msg
             })
-            return PropertyInitializationResponse(
+            return PropertyInitializationResponse.model_construct(
                 session_id=session_id,
                 status="error",
                 error=error_msg
             )
         
-        logger.info(f"Successfully scraped property data for session {session_id}")
-        
-        # Calculate distances if address is available
-        distance_info = None
-        if "address" in property_data and "full_address" in property_data["address"]:
-            logger.info(f"Calculating distances for session {session_id}")
-            distance_info = service_manager.distance_calculator.calculate_distances(
-                property_data["address"]["full_address"],
-                request.categories
-            )
-            logger.info(f"Successfully calculated distances for session {session_id}")
-        
         # Update session with results
-        analysis_sessions[session_id].update({
+        await cache.update_session(session_id, {
             "status": "ready",
             "property_data": property_data,
             "distance_info": distance_info,
             "initialized_at": datetime.now().isoformat()
         })
         
-        logger.info(f"Successfully initialized property analysis for session {session_id}")
+        logger.info("Successfully initialized property analysis for session %s", session_id)
         
-        return PropertyInitializationResponse(
+        return PropertyInitializationResponse.model_construct(
             session_id=session_id,
             status="ready",
             property_data=property_data,
@@ -248,20 +315,71 @@ async def initialize_property(
         )
         
     except Exception as e:
-        error_msg = f"An unexpected error occurred: {str(e)}"
-        logger.error(f"Error initializing property analysis for session {session_id}: {str(e)}", exc_info=True)
-        if session_id in analysis_sessions:
-            analysis_sessions[session_id].update({
-                "status": "error",
-                "error": error_msg
-            })
+        error_msg = f"An unexpected error occurred: {str(e)}" if EXPOSE_ERRORS else "An unexpected error occurred"
+        logger.error("Error initializing property analysis for session %s: %s", session_id, e, exc_info=True)
+        await cache.update_session(session_id, {
+            "status": "error",
+            "error": error_msg
+        })
         
-        return PropertyInitializationResponse(
+        return PropertyInitializationResponse.model_construct(
             session_id=session_id,
             status="error",
             error=error_msg
         )
 
+@router.post("/initialize/batch", response_model=BatchInitializationResponse)
+async def initialize_properties(
+    request: BatchInitializationRequest,
+    service_manager: ServiceManager = Depends(get_service_manager)
+) -> BatchInitializationResponse:
+    """
+    Initialize property analysis for several URLs concurrently.
+    
+    Each URL is initialized exactly as by /initialize, with at most BATCH_CONCURRENCY
+    listings in flight at once. Failures are reported per URL in the results. A URL
+    repeated in the batch is initialized once and its result repeated.
+    
+    Args:
+        request (BatchInitializationRequest): The batch request containing the property URLs
+        service_manager (ServiceManager): Service manager instance
+    
+    Returns:
+        BatchInitializationResponse: One initialization response per URL, in request order
+    """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    
+    async def initialize_one(url: str) -> PropertyInitializationResponse:
+        async with semaphore:
+            return await initialize_property(
+                PropertyInitializationRequest(url=url, categories=request.categories),
+                service_manager
+            )
+    
+    unique_urls = list(dict.fromkeys(request.urls))
+    logger.info("Starting batch initialization for %d URLs", len(unique_urls))
+    results = dict(zip(unique_urls, await asyncio.gather(*(initialize_one(url) for url in unique_urls))))
+    return BatchInitializationResponse.model_construct(results=[results[url] for url in request.urls])
+
+@router.get("/sessions/{session_id}")
+async def get_session(
+    session_id: str,
+    service_manager: ServiceManager = Depends(get_service_manager)
+) -> Dict[str, Any]:
+    """
+    Get the stored state of an analysis session.
+    
+    Sessions expire an hour after their last update, so clients can use this to
+    recover a session's property and distance data before then.
+    
+    Raises:
+        HTTPException: 404 if the session does not exist or has expired
+    """
+    session = await service_manager.cache.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    return {"session_id": session_id, **session}
+
 def get_agent(agent_name: str) -> Optional[BaseAgent]:
     """Get the appropriate agent instance based on the agent name."""
     service_manager = get_service_manager()
@@ -279,7 +397,8 @@ async def analyze_property(request: AnalysisRequest):
             raise HTTPException(status_code=400, detail=f"Unknown agent: {request.agent}")
 
         # Perform the analysis
-        analysis_result = agent.analyze_property(
+        analysis_result = await asyncio.to_thread(
+            agent.analyze_property,
             property_data=request.property_data,
             distance_info=request.distance_info,
             chat_history=request.chat_history,
@@ -296,9 +415,44 @@ async def analyze_property(request: AnalysisRequest):
             agent=request.agent
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error in analyze_property: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+        logger.error("Error in analyze_property: %s", e)
+        raise HTTPException(status_code=500, detail=str(e) if EXPOSE_ERRORS else "Analysis failed")
+
+@router.post("/analyze/stream")
+async def stream_property_analysis(request: AnalysisRequest) -> StreamingResponse:
+    """
+    Analyze a property using the specified agent, streaming the response text as it is generated.
+    
+    The body is the agent's raw output as plain text; for an initial analysis this is the
+    JSON analysis, which clients parse once the stream ends.
+    """
+    try:
+        agent = get_agent(request.agent)
+    except Exception as e:
+        logger.error("Error in stream_property_analysis: %s", e)
+        raise HTTPException(status_code=500, detail=str(e) if EXPOSE_ERRORS else "Analysis failed")
+    if not agent:
+        raise HTTPException(status_code=400, detail=f"Unknown agent: {request.agent}")
+
+    def stream():
+        try:
+            yield from agent.stream_analysis(
+                property_data=request.property_data,
+                distance_info=request.distance_info,
+                chat_history=request.chat_history,
+                current_question=request.current_question
+            )
+        except Exception as e:
+            # The status has been sent by the time the model fails; re-raising aborts the
+            # connection so the client sees an incomplete response rather than a truncated one
+            logger.error("Error in stream_property_analysis: %s", e)
+            raise
+
+    # Starlette iterates the blocking Gemini stream in its thread pool
+    return StreamingResponse(stream(), media_type="text/plain; charset=utf-8")
 
 @router.get("/")
 async def root():
@@ -3,8 +3,11 @@ Main entry point for the FastAPI server.
 This module initializes and runs the FastAPI application with all routes.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from brotli_asgi import BrotliMiddleware
 import uvicorn
 import logging
 from pathlib import Path
@@ -12,24 +15,41 @@ import os
 from dotenv import load_dotenv
 
 # Import routes after FastAPI initialization to avoid circular imports
-from .api.routes import router
+from .api.routes import router, get_service_manager
 
-# Configure logging
+# Load environment variables
+project_root = Path(__file__).parent.parent
+load_dotenv(project_root / "config" / ".env")
+
+# Configure logging once for the whole application (defaults to warning in production)
+IS_PRODUCTION = os.getenv("ENV") == "production"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "warning" if IS_PRODUCTION else "info").lower()
 logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    level=LOG_LEVEL.upper(),
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    force=False
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-project_root = Path(__file__).parent.parent
-load_dotenv(project_root / "config" / ".env")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start shared services before serving traffic and release their resources
+    (HTTP pools, WebDriver, Redis) on shutdown.
+    """
+    service_manager = get_service_manager()
+    service_manager.warm_up()
+    yield
+    logger.info("Shutting down services")
+    await service_manager.close()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Property Analysis API",
     description="API for analyzing property listings from Domain.com.au",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse  # Large property/distance payloads serialize faster with orjson
 )
 
 # Add CORS middleware with specific configuration
@@ -42,6 +62,14 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Compress large JSON responses with Brotli, falling back to gzip for clients without Brotli support
+app.add_middleware(
+    BrotliMiddleware,
+    quality=4,
+    minimum_size=1024,
+    gzip_fallback=True
+)
+
 # Include routers
 app.include_router(router)
 
@@ -54,16 +82,43 @@ async def root():
         "status": "running"
     }
 
-if __name__ == "__main__":
+def serve() -> None:
+    """Run the API with uvicorn, configured for production or development by ENV."""
     # Get port from environment variable or use default
     port = int(os.getenv("API_PORT", "8000"))
     
     # Run the server
-    logger.info(f"Starting server on port {port}")
-    uvicorn.run(
-        "backend.main:app",
-        host="0.0.0.0",
-        port=port,
-        reload=True,  # Enable auto-reload for development
-        log_level="info"
-    ) 
\ No newline at end of file
+    logger.info("Starting server on port %d", port)
+    if IS_PRODUCTION:
+        # uvloop/httptools and multiple workers; sessions and caches are shared through Redis
+        workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+        if workers > 1 and not os.getenv("REDIS_URL"):
+            # Without Redis each worker keeps its own sessions, so requests for a session
+            # handled by another worker would not find it
+            logger.error("REDIS_URL is not set; starting 1 worker instead of %d", workers)
+            workers = 1
+        uvicorn.run(
+            "backend.main:app",
+            host="0.0.0.0",
+            port=port,
+            loop="uvloop",
+            http="httptools",
+            workers=workers,
+            reload=False,
+            access_log=False,
+            log_level=LOG_LEVEL
+        )
+    else:
+        # uvicorn picks uvloop and httptools when they are installed (they are not on Windows)
+        uvicorn.run(
+            "backend.main:app",
+            host="0.0.0.0",
+            port=port,
+            loop="auto",
+            http="auto",
+            reload=True,  # Enable auto-reload for development
+            log_level=LOG_LEVEL
+        )
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,179 @@
+"""
+Property initialization pipeline shared by the API and the command line.
+
+Given a Domain.com.au listing URL, this module:
+1. Reuses cached property data or scrapes the listing
+2. Starts distance calculations as soon as the address is known
+3. Fetches gallery images alongside the distance calculations
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+import orjson
+from dotenv import load_dotenv
+
+if TYPE_CHECKING:
+    from .api.routes import ServiceManager
+
+logger = logging.getLogger(__name__)
+
+class PropertyFetchError(Exception):
+    """Raised when a listing page cannot be fetched or parsed."""
+
+class PropertyAnalysis(NamedTuple):
+    """Scraped property data and distance results for one listing."""
+    property_data: Dict
+    distance_info: Optional[Dict]
+
+async def fetch_images(services: "ServiceManager", url: str, property_data: Dict) -> List[str]:
+    """Fetch gallery images with Selenium unless the page data already included them."""
+    if property_data.get("images"):
+        return property_data["images"]
+    return await services.scraper.get_images(url)
+
+async def calculate_distances(
+    services: "ServiceManager",
+    address: Optional[str],
+    categories: Optional[List[str]]
+) -> Optional[Dict]:
+    """
+    Calculate distances for an address, using cached results when available.
+
+    Returns None when no address is available.
+    """
+    if not address:
+        return None
+
+    cache = services.cache
+    distance_calculator = services.distance_calculator
+    categories = list(categories or distance_calculator.categories)
+
+    # Results are cached per category, so only the missing categories are calculated
+    distance_info = await cache.get_distance_info(address, categories)
+    missing = [category for category in categories if category not in distance_info]
+    if missing:
+        calculated = await distance_calculator.calculate_distances(address, missing)
+        # Categories without routes are not cached: a failed Routes or Places call also leaves
+        # a category empty, and caching it would hide the distances until the entry expires
+        found = {category: locations for category, locations in calculated.items() if locations}
+        if found:
+            await cache.set_distance_info(address, found)
+        distance_info.update(calculated)
+    return {category: distance_info[category] for category in categories if distance_info.get(category)}
+
+async def analyze(
+    url: str,
+    categories: Optional[List[str]] = None,
+    *,
+    services: "ServiceManager",
+    include_images: bool = True
+) -> PropertyAnalysis:
+    """
+    Collect property data and distance information for a listing.
+
+    Args:
+        url: The Domain.com.au property listing URL
+        categories: Location categories for distance calculations; all categories if None
+        services: Service manager providing the scraper, distance calculator and cache
+        include_images: Whether to collect gallery images with Selenium when the page data has none
+
+    Returns:
+        PropertyAnalysis with the property data and distance results
+
+    Raises:
+        PropertyFetchError: If the listing could not be fetched or parsed
+    """
+    cache = services.cache
+
+    property_data = await cache.get_property_data(url)
+    if property_data is not None:
+        logger.info("Using cached property data for %s", url)
+        distance_info = await calculate_distances(
+            services,
+            property_data.get("address", {}).get("full_address"),
+            categories
+        )
+        return PropertyAnalysis(property_data, distance_info)
+
+    # Fetch the listing page; distances can start as soon as its address is known
+    logger.debug("Starting property data scraping for %s", url)
+    scraper = services.scraper
+    html = await scraper.fetch_listing(url)
+
+    distance_task = None
+    quick_address = scraper.quick_address(html) if html else None
+    if quick_address:
+        distance_task = asyncio.create_task(calculate_distances(services, quick_address, categories))
+
+    # Parse the page while distances are calculated (gallery images are fetched below)
+    property_data = await scraper.parse_listing(url, html) if html else None
+
+    if not property_data:
+        if distance_task is not None:
+            distance_task.cancel()
+        raise PropertyFetchError(f"Failed to fetch property data for {url}")
+
+    logger.debug("Successfully scraped property data for %s", url)
+
+    if distance_task is None:
+        distance_task = asyncio.create_task(calculate_distances(
+            services,
+            property_data.get("address", {}).get("full_address"),
+            categories
+        ))
+
+    if not include_images:
+        distance_info = await distance_task
+        return PropertyAnalysis(property_data, distance_info)
+
+    # Fetch images while distances finish
+    logger.debug("Fetching images and calculating distances for %s", url)
+    images, distance_info = await asyncio.gather(
+        fetch_images(services, url, property_data),
+        distance_task
+    )
+    property_data["images"] = images
+    # Only listings with their images are cached; no images may mean the gallery failed to load
+    if images:
+        await cache.set_property_data(url, property_data)
+    logger.info("Successfully enriched property data for %s", url)
+
+    return PropertyAnalysis(property_data, distance_info)
+
+async def _run(args: argparse.Namespace) -> Dict:
+    """Run the pipeline once with a fresh set of services."""
+    from .api.routes import ServiceManager
+
+    services = ServiceManager()
+    try:
+        result = await analyze(args.url, args.categories, services=services, include_images=args.images)
+        return result._asdict()
+    finally:
+        await services.close()
+
+def main() -> None:
+    """Command line entry point: print the property and distance data for a listing as JSON."""
+    parser = argparse.ArgumentParser(description="Collect property and distance data for a Domain.com.au listing")
+    parser.add_argument("url", help="Domain.com.au property listing URL")
+    parser.add_argument("--categories", nargs="+", help="Location categories for distance calculations (default: all)")
+    parser.add_argument("--images", action=argparse.BooleanOptionalAction, default=True,
+                        help="Collect gallery images with Selenium when the page data has none")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    load_dotenv(Path(__file__).parent.parent / "config" / ".env")
+
+    try:
+        result = asyncio.run(_run(args))
+    except PropertyFetchError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    sys.stdout.buffer.write(orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n")
+
+if __name__ == "__main__":
+    main()
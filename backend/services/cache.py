@@ -0,0 +1,193 @@
+"""
+Caching for scraped listings, distance results and analysis sessions.
+
+When REDIS_URL is configured, entries are stored in Redis with a TTL so they are
+shared across workers and survive restarts. Without Redis, entries are kept in
+bounded in-process TTL caches instead.
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+import orjson
+from cachetools import TTLCache
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+class PropertyCache:
+    # Listings and points of interest change rarely
+    PROPERTY_TTL = 24 * 3600
+    DISTANCE_TTL = 7 * 24 * 3600
+    SESSION_TTL = 3600
+    # Part of the cache keys: bump when the shape of DomainScraper's property data or
+    # DistanceCalculator's distance results changes, so entries in the old shape are ignored
+    PROPERTY_SCHEMA_VERSION = 1
+    DISTANCE_SCHEMA_VERSION = 1
+    # Upper bounds on entries kept in memory when Redis is not configured
+    MAX_MEMORY_SESSIONS = 1000
+    MAX_MEMORY_PROPERTIES = 256
+    MAX_MEMORY_DISTANCES = 4096
+
+    def __init__(self, redis_url: Optional[str] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL (REDIS_URL). If None, Redis is not used.
+        """
+        self._redis = Redis.from_url(redis_url) if redis_url else None
+        # Bounded so a long-running server without Redis does not grow forever
+        self._sessions: TTLCache = TTLCache(maxsize=self.MAX_MEMORY_SESSIONS, ttl=self.SESSION_TTL)
+        self._sessions_lock = threading.RLock()
+        # Listings and distances are kept as JSON bytes so callers cannot modify the cached copy
+        self._properties: TTLCache = TTLCache(maxsize=self.MAX_MEMORY_PROPERTIES, ttl=self.PROPERTY_TTL)
+        self._distances: TTLCache = TTLCache(maxsize=self.MAX_MEMORY_DISTANCES, ttl=self.DISTANCE_TTL)
+        self._memory_lock = threading.RLock()
+        logger.info("Property cache initialized (%s)", 'redis' if self._redis else 'in-memory')
+
+    @staticmethod
+    def _hash(value: str) -> str:
+        """Build a fixed-length key component from an arbitrary string."""
+        return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+    def _property_key(self, url: str) -> str:
+        return f"prop:v{self.PROPERTY_SCHEMA_VERSION}:{self._hash(url)}"
+
+    def _session_key(self, session_id: str) -> str:
+        return f"session:{session_id}"
+
+    def _distance_key(self, address: str, category: str) -> str:
+        return f"dist:v{self.DISTANCE_SCHEMA_VERSION}:{self._hash(address)}:{category}"
+
+    async def _get_json(self, key: str) -> Optional[Any]:
+        """Read a JSON value, treating Redis errors as a cache miss."""
+        if self._redis is None:
+            return None
+        try:
+            cached = await self._redis.get(key)
+        except RedisError as e:
+            logger.warning("Redis read failed for %s: %s", key, e)
+            return None
+        return orjson.loads(cached) if cached is not None else None
+
+    async def _set_json(self, key: str, value: Any, ttl: int) -> None:
+        """Write a JSON value, ignoring Redis errors."""
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(key, orjson.dumps(value), ex=ttl)
+        except RedisError as e:
+            logger.warning("Redis write failed for %s: %s", key, e)
+
+    async def get_property_data(self, url: str) -> Optional[Dict]:
+        """Get cached property data for a listing URL."""
+        key = self._property_key(url)
+        if self._redis is None:
+            with self._memory_lock:
+                cached = self._properties.get(key)
+            return orjson.loads(cached) if cached is not None else None
+        return await self._get_json(key)
+
+    async def set_property_data(self, url: str, property_data: Dict) -> None:
+        """Cache property data for a listing URL."""
+        key = self._property_key(url)
+        if self._redis is None:
+            with self._memory_lock:
+                self._properties[key] = orjson.dumps(property_data)
+            return
+        await self._set_json(key, property_data, self.PROPERTY_TTL)
+
+    async def get_distance_info(self, address: str, categories: List[str]) -> Dict[str, List]:
+        """
+        Get cached distance results for an address.
+
+        Returns:
+            Dictionary of category to distance results, containing only the cached categories
+        """
+        if not categories:
+            return {}
+        keys = [self._distance_key(address, category) for category in categories]
+        if self._redis is None:
+            with self._memory_lock:
+                cached = [self._distances.get(key) for key in keys]
+            return {
+                category: orjson.loads(value)
+                for category, value in zip(categories, cached)
+                if value is not None
+            }
+        try:
+            cached = await self._redis.mget(keys)
+        except RedisError as e:
+            logger.warning("Redis read failed for distances to %s: %s", address, e)
+            return {}
+        return {
+            category: orjson.loads(value)
+            for category, value in zip(categories, cached)
+            if value is not None
+        }
+
+    async def set_distance_info(self, address: str, distance_info: Dict[str, List]) -> None:
+        """Cache distance results for an address, one entry per category."""
+        if self._redis is None:
+            with self._memory_lock:
+                for category, locations in distance_info.items():
+                    self._distances[self._distance_key(address, category)] = orjson.dumps(locations)
+            return
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for category, locations in distance_info.items():
+                    pipe.set(self._distance_key(address, category), orjson.dumps(locations), ex=self.DISTANCE_TTL)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Redis write failed for distances to %s: %s", address, e)
+
+    async def update_session(self, session_id: str, fields: Dict[str, Any]) -> None:
+        """
+        Create or update an analysis session.
+
+        Args:
+            session_id: Session identifier
+            fields: Session fields to set; each value is stored as JSON in Redis
+        """
+        if self._redis is None:
+            # cachetools caches are not safe for concurrent writers
+            with self._sessions_lock:
+                session = self._sessions.get(session_id, {})
+                session.update(fields)
+                self._sessions[session_id] = session
+            return
+
+        key = self._session_key(session_id)
+        mapping = {field: orjson.dumps(value) for field, value in fields.items()}
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping=mapping)
+                pipe.expire(key, self.SESSION_TTL)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning("Redis session update failed for %s: %s", session_id, e)
+
+    async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get an analysis session's fields, or None if it does not exist or has expired."""
+        if self._redis is None:
+            with self._sessions_lock:
+                session = self._sessions.get(session_id)
+            return dict(session) if session is not None else None
+
+        try:
+            stored = await self._redis.hgetall(self._session_key(session_id))
+        except RedisError as e:
+            logger.warning("Redis session read failed for %s: %s", session_id, e)
+            return None
+        if not stored:
+            return None
+        return {field.decode(): orjson.loads(value) for field, value in stored.items()}
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        if self._redis is not None:
+            await self._redis.aclose()
@@ -8,22 +8,123 @@ This module provides functionality to:
 4. Format and summarize distance/time information
 """
 
-import requests
-import json
+import asyncio
+import heapq
+import httpx
+import logging
+import random
+import re
+import sqlite3
+import sys
+import weakref
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
 from typing import Dict, List, Optional, Tuple
 import os
+import orjson
 from datetime import datetime, timedelta
-from pathlib import Path
+from cachetools import LRUCache, TTLCache
+
+from ..utils.locations import ANCHORS_BY_CATEGORY
+from .route_store import RouteStore
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_WHITESPACE_RE = re.compile(r'\s+')
+# First word after the first comma of an address
+_SUBURB_RE = re.compile(r',\s*([^\s,]+)')
+
+@lru_cache(maxsize=4096)
+def _normalize_address(address: str) -> str:
+    """
+    Normalize an address for cache keys: lowercase, no punctuation, single spaces.
+    
+    The fixed destinations and the property address are normalized for every travel leg,
+    so results are memoized and interned for cheap key comparisons.
+    """
+    return sys.intern(_WHITESPACE_RE.sub(' ', _PUNCTUATION_RE.sub(' ', address.lower())).strip())
+
+def _log_status_error(api: str, error: httpx.HTTPStatusError) -> None:
+    """Log a failed Google API response; the body is only read when debug logging is on."""
+    logger.warning("%s API returned status %s", api, error.response.status_code)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s API response body: %s", api, error.response.text)
+
+@dataclass(slots=True)
+class RouteResult:
+    """
+    Travel times from a property to one destination.
+    
+    Attributes:
+        destination: Destination address
+        distance_value: Current driving time in seconds, used as the distance measure
+        durations: (mode key, departure slot, seconds or None) for each leg in the category plan
+        store_info: Store name, display name and address for grocery destinations
+    """
+    destination: str
+    distance_value: int
+    durations: Tuple[Tuple[str, str, Optional[int]], ...]
+    store_info: Optional[Dict[str, str]] = None
+    
+    def to_dict(self) -> Dict:
+        """Build the nested result dictionary returned to clients and cached."""
+        modes: Dict[str, Dict[str, Optional[Dict]]] = {}
+        for mode_key, slot, seconds in self.durations:
+            modes.setdefault(mode_key, {})[slot] = DistanceCalculator._duration(seconds)
+        result = {
+            "destination": self.destination,
+            "distance": DistanceCalculator._duration(self.distance_value),
+            "modes": modes
+        }
+        if self.store_info is not None:
+            result["store_info"] = {
+                "name": self.store_info["name"],
+                "display_name": self.store_info["display_name"],
+                "formatted_address": self.store_info["formatted_address"]
+            }
+        return result
 
 class DistanceCalculator:
     # Constants for API endpoints
-    ROUTES_API_ENDPOINT = "https://routes.googleapis.com/directions/v2:computeRoutes"
+    ROUTE_MATRIX_API_ENDPOINT = "https://routes.googleapis.com/distanceMatrix/v2:computeRouteMatrix"
     PLACES_API_ENDPOINT = "https://places.googleapis.com/v1/places:searchText"
     
     # Constants for time calculations
     SECONDS_PER_HOUR = 3600
     SECONDS_PER_MINUTE = 60
     
+    # Maximum concurrent Google API requests, to stay clear of rate limits (GMAPS_MAX_CONCURRENCY overrides).
+    # This caps requests in flight, not requests per second.
+    MAX_CONCURRENT_REQUESTS = 20
+    
+    # Throttled or failed Google API requests are retried with exponential backoff and jitter
+    RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+    MAX_RETRIES = 3
+    RETRY_BACKOFF_SECONDS = 0.5
+    
+    # In-process route cache: size, and the departure-time granularity of its keys
+    ROUTE_CACHE_SIZE = 4096
+    DEPARTURE_BUCKET_SECONDS = 15 * 60
+    
+    # Grocery stores found per suburb, kept for 30 days
+    GROCERY_CACHE_SIZE = 1024
+    GROCERY_CACHE_TTL = 30 * 24 * 3600
+    
+    # Destinations per route matrix request; address waypoints are limited to 50 per request
+    MAX_MATRIX_DESTINATIONS = 25
+    
+    # Travel legs as (mode key in results, Routes travel mode, departure slot)
+    CURRENT_LEGS = (("driving", "DRIVE", "current"), ("transit", "TRANSIT", "current"))
+    WALKING_LEG = ("walking", "WALK", "current")
+    PEAK_LEGS = (
+        ("driving", "DRIVE", "morning_peak"),
+        ("driving", "DRIVE", "evening_peak"),
+        ("transit", "TRANSIT", "morning_peak"),
+        ("transit", "TRANSIT", "evening_peak")
+    )
+    
     def __init__(self, api_key: str):
         """
         Initialize the distance calculator with Google Maps API key.
@@ -31,19 +132,78 @@ class DistanceCalculator:
         Args:
             api_key: Google Maps API key (GOOGLE_MAP_API_KEY)
         """
-        print("\n=== Initializing Distance Calculator ===")
         self.api_key = api_key
-        self.base_url = self.ROUTES_API_ENDPOINT
+        self.matrix_url = self.ROUTE_MATRIX_API_ENDPOINT
         self.places_url = self.PLACES_API_ENDPOINT
         
-        # Load locations from JSON
-        locations_path = Path(__file__).parent.parent / "utils" / "locations.json"
-        with open(locations_path, 'r') as f:
-            self.locations = json.load(f)
+        # Reuse pooled connections across the concurrent Routes/Places calls per property.
+        # Pool limits belong on the transport; the client ignores them when a transport is given.
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30)
+            ),
+            timeout=30
+        )
+        self._semaphore = asyncio.Semaphore(int(os.getenv("GMAPS_MAX_CONCURRENCY", self.MAX_CONCURRENT_REQUESTS)))
+        
+        # Travel times keyed by (origin, destination, mode, departure bucket), plus one lock per
+        # (origin, mode, departure bucket) so concurrent identical lookups make a single request
+        self._route_cache: LRUCache = LRUCache(maxsize=self.ROUTE_CACHE_SIZE)
+        self._route_locks: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        
+        # Grocery stores per lowercased suburb, including suburbs where none were found
+        self._grocery_cache: TTLCache = TTLCache(maxsize=self.GROCERY_CACHE_SIZE, ttl=self.GROCERY_CACHE_TTL)
+        
+        # Routes persisted on disk by departure slot, shared across workers and restarts
+        try:
+            self._route_store: Optional[RouteStore] = RouteStore()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Route store unavailable, using in-memory cache only: %s", e)
+            self._route_store = None
+        
+        # Locations are read from locations.json once, when the module is imported
+        self.anchors = ANCHORS_BY_CATEGORY
         
-        print("✓ Google Maps Routes client initialized successfully")
+        # Legs per category only depend on the locations file, so plan them once
+        self.category_plan = self._build_category_plan()
+        self.categories = tuple(self.category_plan)
+        
+        logger.info("Google Maps Routes client initialized")
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP client and the route store."""
+        await self.client.aclose()
+        if self._route_store is not None:
+            self._route_store.close()
     
-    def _get_suburb_from_address(self, address: str) -> str:
+    async def _post(self, url: str, body: Dict, field_mask: str) -> httpx.Response:
+        """
+        POST a Google Maps API request, limiting how many are in flight at once.
+        
+        Responses with a throttling or server error status are retried.
+        
+        Raises:
+            httpx.HTTPStatusError: If the final response has an error status
+            httpx.HTTPError: If the request could not be sent
+        """
+        headers = {
+            "Content-Type": "application/json",
+            "X-Goog-Api-Key": self.api_key,
+            "X-Goog-FieldMask": field_mask
+        }
+        for attempt in range(self.MAX_RETRIES + 1):
+            async with self._semaphore:
+                response = await self.client.post(url, json=body, headers=headers)
+            if response.status_code not in self.RETRY_STATUSES or attempt == self.MAX_RETRIES:
+                return response.raise_for_status()
+            # Back off outside the semaphore so other requests can proceed meanwhile
+            await asyncio.sleep(self.RETRY_BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5))
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _get_suburb_from_address(address: str) -> str:
         """
         Extract suburb from full address.
         
@@ -53,23 +213,45 @@ class DistanceCalculator:
         Returns:
             Suburb name or empty string if not found
         """
+        # Assuming address format: "Street, Suburb NSW Postcode"
+        match = _SUBURB_RE.search(address)
+        return match.group(1) if match else ""
+    
+    async def _search_places(self, search_query: str) -> Optional[List[Dict]]:
+        """
+        Search the Places API for a text query.
+        
+        Args:
+            search_query: Free-text search, e.g. "Coles Mascot, NSW"
+        
+        Returns:
+            List of places (formattedAddress, displayName), or None on error
+        """
+        logger.debug("Searching for: %s", search_query)
         try:
-            # Assuming address format: "Street, Suburb NSW Postcode"
-            parts = address.split(',')
-            if len(parts) >= 2:
-                suburb = parts[1].strip().split()[0]  # Take first word after comma
-                print(f"✓ Extracted suburb: {suburb}")
-                return suburb
-            print("⚠ No suburb found in address")
-            return ""
-        except Exception as e:
-            print(f"⚠ Error extracting suburb: {e}")
-            return ""
+            body = {
+                "textQuery": search_query,
+                "maxResultCount": 3  # Get up to 3 results to handle duplicates
+            }
+            response = await self._post(
+                self.places_url,
+                body,
+                "places.formattedAddress,places.displayName"
+            )
+            return orjson.loads(response.content).get("places", [])
+        except httpx.HTTPStatusError as e:
+            _log_status_error("Places", e)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning("Error searching for %s: %s", search_query, e)
+        return None
     
-    def _get_grocery_locations(self, property_address: str) -> List[Dict[str, str]]:
+    async def _get_grocery_locations(self, property_address: str) -> List[Dict[str, str]]:
         """
         Get grocery store locations with specific addresses using Places API.
         
+        The searches for each store chain run concurrently. Results are cached per suburb,
+        including suburbs without any valid store, unless a search failed.
+        
         Args:
             property_address: The full property address
         
@@ -81,108 +263,193 @@ class DistanceCalculator:
         """
         suburb = self._get_suburb_from_address(property_address)
         if not suburb:
+            logger.warning("No suburb found in address: %s", property_address)
             return []
         
-        print(f"\n=== Searching for grocery stores in {suburb} ===")
+        suburb_key = suburb.lower()
+        cached = self._grocery_cache.get(suburb_key)
+        if cached is not None:
+            return cached
+        
+        logger.debug("Searching for grocery stores in %s", suburb)
+        stores = [anchor.template for anchor in self.anchors.get("groceries", ())]
+        search_results = await asyncio.gather(
+            *(self._search_places(f"{store} {suburb}, NSW") for store in stores)
+        )
+        
         grocery_locations = []
         seen_addresses = set()  # Track unique addresses to avoid duplicates
         
-        for store in self.locations["groceries"]:
-            search_query = f"{store} {suburb}, NSW"
-            print(f"\nSearching for: {search_query}")
+        for store, places in zip(stores, search_results):
+            if not places:
+                logger.debug("No %s found in %s", store, suburb)
+                continue
             
-            try:
-                # Call Places API to get specific store address
-                headers = {
-                    "Content-Type": "application/json",
-                    "X-Goog-Api-Key": self.api_key,
-                    "X-Goog-FieldMask": "places.formattedAddress,places.displayName"
-                }
-                
-                body = {
-                    "textQuery": search_query,
-                    "maxResultCount": 3  # Get up to 3 results to handle duplicates
-                }
+            # Try each result until we find a new, valid store
+            found_valid_store = False
+            for place in places:
+                address = place.get("formattedAddress", "")
+                display_name = place.get("displayName", {}).get("text", store)
                 
-                response = requests.post(
-                    self.places_url,
-                    json=body,
-                    headers=headers
-                )
+                # Validation checks
+                if address in seen_addresses:
+                    logger.debug("Skipping duplicate address: %s", address)
+                    continue
+                    
+                if suburb.lower() not in address.lower():
+                    logger.debug("Address not in target suburb: %s", address)
+                    continue
+                    
+                if store.lower() not in display_name.lower():
+                    logger.debug("Not a %s store: %s", store, display_name)
+                    continue
                 
-                if response.status_code == 200:
-                    data = response.json()
-                    if "places" in data and data["places"]:
-                        # Try each result until we find a new, valid store
-                        found_valid_store = False
-                        for place in data["places"]:
-                            address = place.get("formattedAddress", "")
-                            display_name = place.get("displayName", {}).get("text", store)
-                            
-                            # Validation checks
-                            if address in seen_addresses:
-                                print(f"  ⚠ Skipping duplicate address: {address}")
-                                continue
-                                
-                            if suburb.lower() not in address.lower():
-                                print(f"  ⚠ Address not in target suburb: {address}")
-                                continue
-                                
-                            if store.lower() not in display_name.lower():
-                                print(f"  ⚠ Not a {store} store: {display_name}")
-                                continue
-                            
-                            # Add the store if it passes all checks
-                            grocery_locations.append({
-                                "name": store,
-                                "display_name": display_name,
-                                "formatted_address": address
-                            })
-                            seen_addresses.add(address)
-                            found_valid_store = True
-                            print(f"  ✓ Found store: {display_name}")
-                            print(f"    Address: {address}")
-                            break
-                        
-                        if not found_valid_store:
-                            print(f"  ⚠ No valid {store} found in {suburb}")
-                    else:
-                        print(f"  ⚠ No {store} found in {suburb}")
-                else:
-                    print(f"  ⚠ API Error ({response.status_code}): {response.text}")
+                # Add the store if it passes all checks
+                grocery_locations.append({
+                    "name": store,
+                    "display_name": display_name,
+                    "formatted_address": address
+                })
+                seen_addresses.add(address)
+                found_valid_store = True
+                logger.debug("Found store: %s (%s)", display_name, address)
+                break
             
-            except Exception as e:
-                print(f"  ⚠ Error searching for {store}: {e}")
+            if not found_valid_store:
+                logger.debug("No valid %s found in %s", store, suburb)
         
-        print(f"\nFound {len(grocery_locations)} valid grocery stores in {suburb}")
+        logger.debug("Found %d valid grocery stores in %s", len(grocery_locations), suburb)
+        if all(places is not None for places in search_results):
+            self._grocery_cache[suburb_key] = grocery_locations
         return grocery_locations
     
-    def _get_travel_time(self, origin: str, destination: str, mode: str, departure_time: datetime) -> Optional[Dict]:
+    def _build_category_plan(self) -> Dict[str, Tuple[Tuple[str, str, str], ...]]:
         """
-        Get travel time between two points using Routes API.
+        Work out which travel legs are needed for each location category.
+        
+        Returns:
+            Dictionary mapping category to (mode key, Routes travel mode, departure slot) tuples
+        """
+        plan = {}
+        for category in self.anchors:
+            legs = list(self.CURRENT_LEGS)
+            # Walking times for groceries and schools
+            if category in ["groceries", "schools"]:
+                legs.append(self.WALKING_LEG)
+            # Peak times for work locations
+            if category == "work":
+                legs.extend(self.PEAK_LEGS)
+            plan[category] = tuple(legs)
+        return plan
+    
+    async def _get_travel_times(self, origin: str, destinations: List[str], mode: str, slot: str, departure_time: datetime) -> List[Optional[int]]:
+        """
+        Get travel times from one origin to several destinations, reusing cached routes.
+        
+        Routes are cached in-process by normalized origin and destination, travel mode and
+        15-minute departure bucket, and on disk by departure slot (see _store_slot). Only
+        destinations found in neither cache are requested.
         
         Args:
             origin: Starting address
-            destination: Ending address
+            destinations: Ending addresses
             mode: Transport mode ('DRIVE', 'TRANSIT', or 'WALK')
+            slot: Departure slot ('current', 'morning_peak' or 'evening_peak')
             departure_time: When the journey starts
+            
+        Returns:
+            List aligned with destinations, holding durations in seconds or None where no route was found
+        """
+        origin_key = _normalize_address(origin)
+        bucket = int(departure_time.timestamp()) // self.DEPARTURE_BUCKET_SECONDS
+        keys = [(origin_key, _normalize_address(destination), mode, bucket) for destination in destinations]
+        
+        lock = self._route_locks.get((origin_key, mode, bucket))
+        if lock is None:
+            lock = self._route_locks[(origin_key, mode, bucket)] = asyncio.Lock()
+        
+        async with lock:
+            travel_times = [self._route_cache.get(key) for key in keys]
+            missing = [i for i, travel_time in enumerate(travel_times) if travel_time is None]
+            
+            # Current travel times are stored by time of day, since traffic changes through the day
+            store_slot = self._store_slot(slot, departure_time)
+            if missing and self._route_store is not None:
+                stored = await asyncio.to_thread(
+                    self._route_store.get_many,
+                    [(origin_key, keys[i][1], mode, store_slot) for i in missing]
+                )
+                for i, travel_time in zip(missing, stored):
+                    if travel_time is not None:
+                        travel_times[i] = self._route_cache[keys[i]] = travel_time
+                missing = [i for i in missing if travel_times[i] is None]
+            
+            if missing:
+                # Split large destination lists into chunks that fit one matrix request each
+                pending = [destinations[i] for i in missing]
+                chunks = [
+                    pending[start:start + self.MAX_MATRIX_DESTINATIONS]
+                    for start in range(0, len(pending), self.MAX_MATRIX_DESTINATIONS)
+                ]
+                # Format the departure time once for every chunk of this leg
+                departure_iso = departure_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+                chunk_results = await asyncio.gather(*(
+                    self._request_travel_times(origin, chunk, mode, departure_iso) for chunk in chunks
+                ))
+                fetched = [travel_time for chunk_times in chunk_results for travel_time in chunk_times]
+                found = []
+                for i, travel_time in zip(missing, fetched):
+                    travel_times[i] = travel_time
+                    # Failed lookups are not cached so they are retried next time
+                    if travel_time is not None:
+                        self._route_cache[keys[i]] = travel_time
+                        found.append(((origin_key, keys[i][1], mode, store_slot), travel_time))
+                if found and self._route_store is not None:
+                    await asyncio.to_thread(self._route_store.set_many, found)
+        return travel_times
+    
+    @staticmethod
+    def _store_slot(slot: str, departure_time: datetime) -> str:
+        """
+        Get the departure slot travel times are stored under on disk.
+        
+        Peak slots are stored as they are. Current travel times are stored under the peak
+        slot when departing during weekday peak hours, and as "off_peak" otherwise.
         """
+        if slot != "current":
+            return slot
+        if departure_time.weekday() < 5:
+            if 7 <= departure_time.hour < 10:
+                return "morning_peak"
+            if 16 <= departure_time.hour < 19:
+                return "evening_peak"
+        return "off_peak"
+    
+    async def _request_travel_times(self, origin: str, destinations: List[str], mode: str, departure_time: str) -> List[Optional[int]]:
+        """
+        Get travel times from one origin to several destinations in a single route matrix request.
+        
+        Args:
+            origin: Starting address
+            destinations: Ending addresses
+            mode: Transport mode ('DRIVE', 'TRANSIT', or 'WALK')
+            departure_time: When the journey starts, as an RFC 3339 timestamp
+            
+        Returns:
+            List aligned with destinations, holding durations in seconds or None where no route was found
+        """
+        travel_times: List[Optional[int]] = [None] * len(destinations)
         try:
-            print(f"Requesting {mode} route from Google Maps API:")
-            print(f"  From: {origin}")
-            print(f"  To: {destination}")
-            print(f"  Departure: {departure_time.strftime('%Y-%m-%d %H:%M')}")
+            logger.debug(
+                "Requesting %s route matrix from %s to %d destinations departing %s",
+                mode, origin, len(destinations), departure_time
+            )
             
             # Prepare the request body
             request_body = {
-                "origin": {
-                    "address": origin
-                },
-                "destination": {
-                    "address": destination
-                },
+                "origins": [{"waypoint": {"address": origin}}],
+                "destinations": [{"waypoint": {"address": destination}} for destination in destinations],
                 "travelMode": mode,
-                "computeAlternativeRoutes": False,
                 "languageCode": "en-US",
                 "units": "METRIC"
             }
@@ -191,68 +458,48 @@ class DistanceCalculator:
             if mode == "DRIVE":
                 request_body.update({
                     "routingPreference": "TRAFFIC_AWARE",
-                    "departureTime": departure_time.strftime("%Y-%m-%dT%H:%M:%SZ"),
-                    "routeModifiers": {
-                        "avoidTolls": False,
-                        "avoidHighways": False,
-                        "avoidFerries": False
-                    }
+                    "departureTime": departure_time
                 })
             # Add departure time for transit mode
             elif mode == "TRANSIT":
                 request_body.update({
-                    "departureTime": departure_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+                    "departureTime": departure_time
                 })
             
             # Make the API request
-            headers = {
-                "Content-Type": "application/json",
-                "X-Goog-Api-Key": self.api_key,
-                "X-Goog-FieldMask": "routes.duration,routes.distanceMeters,routes.legs"
-            }
-            
-            response = requests.post(
-                self.base_url,
-                json=request_body,
-                headers=headers
+            response = await self._post(
+                self.matrix_url,
+                request_body,
+                "originIndex,destinationIndex,duration,distanceMeters,condition"
             )
             
-            if response.status_code == 200:
-                data = response.json()
-                if "routes" in data and data["routes"]:
-                    route = data["routes"][0]
-                    duration_seconds = int(route["duration"].rstrip('s'))  # Remove 's' from duration string
-                    distance_meters = route["distanceMeters"]
-                    
-                    # Convert duration to human-readable format
-                    hours = duration_seconds // self.SECONDS_PER_HOUR
-                    minutes = (duration_seconds % self.SECONDS_PER_HOUR) // self.SECONDS_PER_MINUTE
-                    duration_text = f"{hours} hr {minutes} min" if hours > 0 else f"{minutes} min"
-                    
-                    # Convert distance to human-readable format
-                    distance_km = round(distance_meters / 1000, 1)
-                    distance_text = f"{distance_km} km"
-                    
-                    print(f"  Success: {duration_text} by {mode}")
-                    return {
-                        "text": duration_text,
-                        "value": duration_seconds
-                    }
-            else:
-                print(f"  Error: API returned status code {response.status_code}")
-                print(f"  Response: {response.text}")
+            # The matrix response is a list of elements, one per origin/destination pair
+            for element in orjson.loads(response.content):
+                if element.get("condition") != "ROUTE_EXISTS" or "duration" not in element:
+                    continue
+                # Durations are always suffixed with 's'
+                travel_times[element.get("destinationIndex", 0)] = int(element["duration"][:-1])
             
-            print(f"  Error: No route found for {mode}")
-            return None
+            if logger.isEnabledFor(logging.DEBUG):
+                found = sum(1 for travel_time in travel_times if travel_time is not None)
+                logger.debug("Found %d/%d routes by %s", found, len(destinations), mode)
+            return travel_times
             
-        except Exception as e:
-            print(f"  Error calculating {mode} time: {e}")
-            return None
+        except httpx.HTTPStatusError as e:
+            _log_status_error("Routes", e)
+            return travel_times
+        except (httpx.HTTPError, ValueError, LookupError) as e:
+            logger.warning("Error calculating %s times: %s", mode, e)
+            return travel_times
     
-    def calculate_distances(self, property_address: str, categories: Optional[List[str]] = None) -> Dict:
+    async def calculate_distances(self, property_address: str, categories: Optional[List[str]] = None) -> Dict:
         """
         Calculate distances from property to specified locations.
         
+        Destinations from all requested categories are grouped by travel mode and departure
+        time, so each combination needs only one route matrix request. The requests run
+        concurrently.
+        
         Args:
             property_address: The address of the property
             categories: List of location categories to check (e.g., ["work", "groceries"])
@@ -261,113 +508,101 @@ class DistanceCalculator:
         Returns:
             Dictionary containing distances and travel times to each location
         """
-        print(f"\nCalculating distances from: {property_address}")
+        routes = await self._calculate_routes(property_address, categories)
+        return {
+            category: [route.to_dict() for route in category_routes]
+            for category, category_routes in routes.items()
+        }
+    
+    async def _calculate_routes(self, property_address: str, categories: Optional[List[str]] = None) -> Dict[str, List[RouteResult]]:
+        """
+        Calculate travel times from property to specified locations.
         
-        if not categories:
-            categories = self.locations.keys()
+        Args:
+            property_address: The address of the property
+            categories: List of location categories to check; all categories if None
         
-        results = {}
+        Returns:
+            Dictionary of category to route results, omitting categories without any route
+        """
+        logger.debug("Calculating distances from: %s", property_address)
+        
+        if not categories:
+            categories = self.categories
+        categories = [category for category in categories if category in self.category_plan]
         
         # Get times for different scenarios
         current_time = datetime.now()
         next_business_day = current_time + timedelta(days=1)
-        morning_peak = next_business_day.replace(hour=9, minute=0, second=0)
-        evening_peak = next_business_day.replace(hour=17, minute=0, second=0)
+        departure_times = {
+            "current": current_time,
+            "morning_peak": next_business_day.replace(hour=9, minute=0, second=0),
+            "evening_peak": next_business_day.replace(hour=17, minute=0, second=0)
+        }
         
+        # Resolve destinations per category
+        category_locations = {}
         for category in categories:
-            print(f"\nProcessing category: {category}")
-            category_results = []
-            
-            # Get locations based on category
             if category == "groceries":
-                locations = self._get_grocery_locations(property_address)
-                print(f"Found {len(locations)} grocery stores in suburb")
+                locations = await self._get_grocery_locations(property_address)
                 # For groceries, use the formatted_address from Places API
                 destinations = [loc["formatted_address"] for loc in locations]
             else:
-                locations = self.locations.get(category, [])
-                print(f"Processing {len(locations)} {category} locations")
+                locations = [anchor.template for anchor in self.anchors.get(category, ())]
                 destinations = locations
-            
+            category_locations[category] = (locations, destinations)
+        
+        # Group destinations by (travel mode, departure slot) so each pair is one request.
+        # Destinations are deduplicated by normalized address, so spelling variants of
+        # the same place across categories are only requested once.
+        leg_destinations: Dict[Tuple[str, str], Dict[str, str]] = {}
+        for category, (_, destinations) in category_locations.items():
+            for _, mode, slot in self.category_plan[category]:
+                pending = leg_destinations.setdefault((mode, slot), {})
+                for destination in destinations:
+                    pending.setdefault(_normalize_address(destination), destination)
+        
+        legs = list(leg_destinations.items())
+        leg_results = await asyncio.gather(*(
+            self._get_travel_times(property_address, list(destinations.values()), mode, slot, departure_times[slot])
+            for (mode, slot), destinations in legs
+        ))
+        
+        # Travel times keyed by (mode, slot, normalized destination)
+        leg_times: Dict[Tuple[str, str, str], Optional[int]] = {}
+        for ((mode, slot), destinations), travel_times in zip(legs, leg_results):
+            for destination_key, travel_time in zip(destinations, travel_times):
+                leg_times[(mode, slot, destination_key)] = travel_time
+        
+        # Fan the matrix results back out to each category
+        results: Dict[str, List[RouteResult]] = {}
+        for category, (locations, destinations) in category_locations.items():
+            plan = self.category_plan[category]
+            category_results = []
             for idx, destination in enumerate(destinations):
-                print(f"\nCalculating times to: {destination}")
-                try:
-                    # Get initial route for distance
-                    initial_route = self._get_travel_time(
-                        property_address,
-                        destination,
-                        "DRIVE",
-                        current_time
-                    )
-                    
-                    if initial_route:
-                        result = {
-                            "destination": destination,
-                            "distance": {
-                                "text": initial_route["text"],
-                                "value": initial_route["value"]
-                            },
-                            "modes": {
-                                "driving": {
-                                    "current": self._get_travel_time(
-                                        property_address, destination, "DRIVE", current_time
-                                    )
-                                }
-                            }
-                        }
-                        
-                        # For groceries, add the display name and formatted address
-                        if category == "groceries":
-                            result.update({
-                                "store_info": {
-                                    "name": locations[idx]["name"],
-                                    "display_name": locations[idx]["display_name"],
-                                    "formatted_address": locations[idx]["formatted_address"]
-                                }
-                            })
-                        
-                        # Add transit times for all categories
-                        result["modes"]["transit"] = {
-                            "current": self._get_travel_time(
-                                property_address, destination, "TRANSIT", current_time
-                            )
-                        }
-                        
-                        # Add walking times for groceries and schools
-                        if category in ["groceries", "schools"]:
-                            result["modes"]["walking"] = {
-                                "current": self._get_travel_time(
-                                    property_address, destination, "WALK", current_time
-                                )
-                            }
-                        
-                        # Add peak times for work locations
-                        if category == "work":
-                            result["modes"]["driving"]["morning_peak"] = self._get_travel_time(
-                                property_address, destination, "DRIVE", morning_peak
-                            )
-                            result["modes"]["driving"]["evening_peak"] = self._get_travel_time(
-                                property_address, destination, "DRIVE", evening_peak
-                            )
-                            result["modes"]["transit"]["morning_peak"] = self._get_travel_time(
-                                property_address, destination, "TRANSIT", morning_peak
-                            )
-                            result["modes"]["transit"]["evening_peak"] = self._get_travel_time(
-                                property_address, destination, "TRANSIT", evening_peak
-                            )
-                        
-                        category_results.append(result)
-                        print(f"Successfully calculated times for {destination}")
+                destination_key = _normalize_address(destination)
+                # Driving time now doubles as the distance measure
+                initial_route = leg_times.get(("DRIVE", "current", destination_key))
+                if initial_route is None:
+                    continue
                 
-                except Exception as e:
-                    print(f"Error calculating distance to {destination}: {e}")
+                category_results.append(RouteResult(
+                    destination=destination,
+                    distance_value=initial_route,
+                    durations=tuple(
+                        (mode_key, slot, leg_times.get((mode, slot, destination_key)))
+                        for mode_key, mode, slot in plan
+                    ),
+                    # For groceries, keep the display name and formatted address
+                    store_info=locations[idx] if category == "groceries" else None
+                ))
             
             if category_results:
                 results[category] = category_results
         
         return results
     
-    def get_nearest_locations(self, property_address: str, limit: int = 1) -> Dict[str, List[Dict]]:
+    async def get_nearest_locations(self, property_address: str, limit: int = 1) -> Dict[str, List[Dict]]:
         """
         Get the nearest locations for each category.
         
@@ -378,18 +613,14 @@ class DistanceCalculator:
         Returns:
             Dictionary with categories and their nearest locations
         """
-        all_distances = self.calculate_distances(property_address)
-        nearest_locations = {}
-        
-        for category, locations in all_distances.items():
-            # Sort locations by distance value
-            sorted_locations = sorted(
-                locations,
-                key=lambda x: x["distance"]["value"]
-            )
-            nearest_locations[category] = sorted_locations[:limit]
-        
-        return nearest_locations
+        routes = await self._calculate_routes(property_address)
+        return {
+            category: [
+                route.to_dict()
+                for route in heapq.nsmallest(limit, category_routes, key=attrgetter("distance_value"))
+            ]
+            for category, category_routes in routes.items()
+        }
     
     def format_distance_summary(self, distances: Dict) -> str:
         """
@@ -408,13 +639,14 @@ class DistanceCalculator:
                 continue
                 
             summary.append(f"\n{category.upper()} LOCATIONS:")
-            # Sort locations by driving time
-            sorted_locations = sorted(
-                locations,
-                key=lambda x: x["modes"]["driving"]["current"]["value"] if x["modes"]["driving"]["current"] else float('inf')
-            )
+            # Sort locations by driving time, extracting each sort key once
+            decorated = [
+                ((location["modes"]["driving"]["current"] or {}).get("value", float('inf')), idx, location)
+                for idx, location in enumerate(locations)
+            ]
+            decorated.sort()
             
-            for location in sorted_locations:
+            for _, _, location in decorated:
                 summary.append(f"\n{location['destination']}")
                 summary.append(f"Distance: {location['distance']['text']}")
                 
@@ -446,8 +678,19 @@ class DistanceCalculator:
                         summary.append(f"  Current: {walking['current']['text']}")
                 
                 summary.append("-" * 50)
+        
+        return "\n".join(summary)
 
-    def _format_duration(self, duration_seconds: int) -> str:
+    @classmethod
+    def _duration(cls, duration_seconds: Optional[int]) -> Optional[Dict]:
+        """Build the {"text", "value"} duration returned to clients, or None when there is no route."""
+        if duration_seconds is None:
+            return None
+        return {"text": cls._format_duration(duration_seconds), "value": duration_seconds}
+    
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_duration(duration_seconds: int) -> str:
         """
         Convert duration from seconds to human-readable format.
         
@@ -457,11 +700,13 @@ class DistanceCalculator:
         Returns:
             Formatted string like "2 hr 30 min" or "45 min"
         """
-        hours = duration_seconds // self.SECONDS_PER_HOUR
-        minutes = (duration_seconds % self.SECONDS_PER_HOUR) // self.SECONDS_PER_MINUTE
+        hours = duration_seconds // DistanceCalculator.SECONDS_PER_HOUR
+        minutes = (duration_seconds % DistanceCalculator.SECONDS_PER_HOUR) // DistanceCalculator.SECONDS_PER_MINUTE
         return f"{hours} hr {minutes} min" if hours > 0 else f"{minutes} min"
 
-    def _format_distance(self, meters: int) -> str:
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _format_distance(meters: int) -> str:
         """
         Convert distance from meters to human-readable format.
         
@@ -0,0 +1,93 @@
+"""
+Persistent on-disk store for route travel times.
+
+Travel times between the same addresses barely change from day to day, so they are
+kept in a local SQLite database and reused across requests, workers and restarts.
+Entries are keyed by origin, destination, travel mode and departure slot
+("off_peak", "morning_peak" or "evening_peak") and expire after a TTL.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RouteKey = Tuple[str, str, str, str]
+
+DEFAULT_ROUTE_CACHE_PATH = Path.home() / ".cache" / "deep_prop_search" / "routes.db"
+
+class RouteStore:
+    # Matches the distance results cache in PropertyCache
+    ROUTE_TTL = 7 * 24 * 3600
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Open (or create) the route database.
+
+        Args:
+            path: Database file path. Defaults to ROUTE_CACHE_PATH, or
+                  ~/.cache/deep_prop_search/routes.db when that is not set.
+        """
+        path = Path(path or os.getenv("ROUTE_CACHE_PATH") or DEFAULT_ROUTE_CACHE_PATH).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the worker threads; sqlite3 connections are not safe for concurrent use
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        # WAL lets several server workers read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS travel_times (key TEXT PRIMARY KEY, seconds INTEGER NOT NULL, expires REAL NOT NULL)"
+        )
+        logger.info("Route store opened at %s", path)
+
+    @staticmethod
+    def _hash(key: RouteKey) -> str:
+        """Build a fixed-length database key from a route key."""
+        return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+
+    def get_many(self, keys: List[RouteKey]) -> List[Optional[int]]:
+        """
+        Look up stored travel times.
+
+        Returns:
+            List aligned with keys, holding the stored travel time in seconds or None when missing or expired
+        """
+        if not keys:
+            return []
+        hashed = [self._hash(key) for key in keys]
+        placeholders = ",".join("?" * len(hashed))
+        try:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, seconds FROM travel_times WHERE key IN ({placeholders}) AND expires > ?",
+                    (*hashed, time.time())
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning("Route store read failed: %s", e)
+            return [None] * len(keys)
+        found = dict(rows)
+        return [found.get(key) for key in hashed]
+
+    def set_many(self, items: Iterable[Tuple[RouteKey, int]]) -> None:
+        """Store travel times in seconds, replacing any existing entries."""
+        expires = time.time() + self.ROUTE_TTL
+        rows = [(self._hash(key), seconds, expires) for key, seconds in items]
+        if not rows:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO travel_times VALUES (?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logger.warning("Route store write failed: %s", e)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
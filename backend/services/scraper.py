@@ -1,22 +1,114 @@
-import requests
-from bs4 import BeautifulSoup
-import json
-from typing import Dict, Optional
+import asyncio
+import httpx
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+import orjson
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 import random
-import time
 import re
+import threading
+from functools import cached_property
+from cachetools import LRUCache
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Pre-compiled patterns for numeric values
+_NUM_RE = re.compile(r'\d+')
+_FLOAT_RE = re.compile(r'[\d.]+')
+_PRICE_HINT_RE = re.compile(r'\$|price|from|offers', re.IGNORECASE)
+_PRICE_RE = re.compile(r'\$\s*(\d[\d,]*)(?:\.\d+)?')
+_TESTID_SELECTOR_RE = re.compile(r'^(\w*)\[data-testid="([^"]+)"\]$')
+# Address in the listing summary of the raw __NEXT_DATA__ JSON, without nested objects before it
+_SUMMARY_ADDRESS_RE = re.compile(r'"listingSummary":\{[^{}]*?"address":("(?:[^"\\]|\\.)*")')
+
+# Selectors tried in order until one matches
+_PRICE_SELECTORS = (
+    '[data-testid="listing-details__summary-title"]',
+    '[data-testid="listing-details__price"]',
+    '[data-testid="listing-details__price-text"]',
+    '.listing-price',
+)
+_PROPERTY_TYPE_SELECTORS = (
+    'div[data-testid="listing-summary-property-type"]',
+    'span[data-testid="property-features-feature-property_type"]',
+    'div.property-info__property-type',
+)
+_ADDRESS_SELECTORS = (
+    'h1[data-testid="listing-details__button-copy-link"]',
+    'div[data-testid="listing-details__button-copy-wrapper"]',
+    'div[data-testid="listing-summary-address"]',
+    'h1.property-info__address',
+)
+
+# Variations of feature names as they appear in listings
+_FEATURE_VARIATIONS = {
+    "Bed": ("bed", "beds", "bedroom", "bedrooms"),
+    "Bath": ("bath", "baths", "bathroom", "bathrooms"),
+    "Parking": ("parking", "car space", "car spaces", "garage", "garages"),
+}
+
+# Reads the Next.js page payload from the loaded listing
+_NEXT_DATA_JS = "const el = document.getElementById('__NEXT_DATA__'); return el ? el.textContent : null;"
+
+def _find_values(data, key: str):
+    """Yield every value stored under `key` anywhere in a nested JSON structure."""
+    if isinstance(data, dict):
+        for k, v in data.items():
+            if k == key:
+                yield v
+            yield from _find_values(v, key)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _find_values(item, key)
+
+def _or_else(value, fallback):
+    """Return `value` unless it is missing, in which case compute `fallback()`."""
+    return fallback() if value is None or value == "" else value
+
+class _ListingPage:
+    """Parsed listing page with its data-testid elements indexed in a single tree walk."""
+
+    def __init__(self, html: str):
+        self.tree = HTMLParser(html)
+        self._by_testid: Dict[str, list] = {}
+        for node in self.tree.css('[data-testid]'):
+            self._by_testid.setdefault(node.attributes.get('data-testid'), []).append(node)
+
+    @cached_property
+    def spans(self) -> list:
+        """All span elements, shared by the feature lookups."""
+        return self.tree.css('span')
+
+    def css(self, selector: str) -> list:
+        """Match a selector, answering `tag[data-testid="..."]` selectors from the index."""
+        match = _TESTID_SELECTOR_RE.match(selector)
+        if not match:
+            return self.tree.css(selector)
+        tag, testid = match.groups()
+        nodes = self._by_testid.get(testid, [])
+        return [node for node in nodes if node.tag == tag] if tag else nodes
+
+    def css_first(self, selector: str):
+        """Return the first element matching a selector, or None."""
+        nodes = self.css(selector)
+        return nodes[0] if nodes else None
+
 class DomainScraper:
+    # Total size in characters of the listing pages kept for conditional re-fetching (ETag / Last-Modified)
+    PAGE_CACHE_MAX_CHARS = 16 * 1024 * 1024
+    # Random delay in seconds before each listing request, to avoid hammering Domain.com.au.
+    # Revalidating a cached page usually ends in a bodiless 304, so it waits less.
+    REQUEST_DELAY = (1, 3)
+    REVALIDATION_DELAY = (0, 0.5)
+
     def __init__(self):
         """Initialize the Domain.com.au scraper with required headers and configuration."""
         self.headers = {
@@ -31,184 +123,293 @@ class DomainScraper:
             'Sec-Fetch-Site': 'none',
             'Sec-Fetch-User': '?1',
         }
-        self.session = requests.Session()
+        # The listing fields are server-rendered, so plain HTTP is enough for them.
+        # One pooled HTTP/2 client is reused for every request made by this scraper.
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            ),
+            headers=self.headers,
+            follow_redirects=True,
+            timeout=30,
+        )
+        
+        # Selenium is only needed for the JavaScript gallery, so start it on demand.
+        # A single driver is shared, so gallery walks are serialized.
+        self._driver = None
+        self._driver_lock = threading.Lock()
         
-        # Initialize Chrome options for Selenium
-        chrome_options = Options()
-        chrome_options.add_argument('--headless')  # Run in headless mode
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        self.driver = webdriver.Chrome(options=chrome_options)
-        logger.info("Initialized WebDriver")
+        # url -> (revalidation headers, html) for pages that sent cache validators, bounded by HTML size
+        self._page_cache: LRUCache = LRUCache(
+            maxsize=self.PAGE_CACHE_MAX_CHARS,
+            getsizeof=lambda entry: len(entry[1])
+        )
 
-    def __del__(self):
-        """Cleanup method to ensure WebDriver is closed when the scraper is destroyed."""
-        if hasattr(self, 'driver'):
+    @property
+    def driver(self) -> webdriver.Chrome:
+        """Lazy initialization of the Chrome WebDriver used for image extraction."""
+        if self._driver is None:
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')  # Run in headless mode
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            self._driver = webdriver.Chrome(options=chrome_options)
+            logger.info("Initialized WebDriver")
+        return self._driver
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client and the WebDriver, if one was started."""
+        await self.client.aclose()
+        self._quit_driver()
+
+    def _quit_driver(self) -> None:
+        """Quit the WebDriver if it was started."""
+        if getattr(self, '_driver', None) is not None:
             try:
-                self.driver.quit()
+                self._driver.quit()
                 logger.info("Closed WebDriver")
             except Exception as e:
-                logger.error(f"Error closing WebDriver: {e}")
+                logger.error("Error closing WebDriver: %s", e)
+            self._driver = None
 
-    def get_property_data(self, url: str) -> Optional[Dict]:
+    def __del__(self):
+        """Cleanup method to ensure WebDriver is closed when the scraper is destroyed."""
+        self._quit_driver()
+
+    async def get_property_data(self, url: str, include_images: bool = True) -> Optional[Dict]:
         """
         Scrape property information from a Domain.com.au listing URL.
         
         Args:
             url: The Domain.com.au property listing URL
+            include_images: Whether to open the listing in Selenium to collect gallery images
             
         Returns:
             Dictionary containing property details or None if failed
         """
-        try:
-            # Add a random delay between requests (1-3 seconds)
-            time.sleep(random.uniform(1, 3))
-            
-            # Use Selenium to get the page content with JavaScript executed
-            self.driver.get(url)
-            
-            # Wait for the page to load and expand the description
-            wait = WebDriverWait(self.driver, 10)
-            try:
-                # Try to find and click the "Read more" button
-                read_more_button = wait.until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, '[data-testid="listing-details__description"] button'))
-                )
-                read_more_button.click()
-                # Wait for the content to expand
-                time.sleep(2)
-            except:
-                # If no "Read more" button is found, continue
-                pass
-            
-            # Get the page source after JavaScript execution
-            page_source = self.driver.page_source
+        html = await self.fetch_listing(url)
+        if html is None:
+            return None
+        
+        property_data = await self.parse_listing(url, html)
+        if property_data is not None and not property_data["images"] and include_images:
+            property_data["images"] = await self.get_images(url)
+        return property_data
+
+    async def fetch_listing(self, url: str) -> Optional[str]:
+        """
+        Fetch the server-rendered HTML of a listing page.
+        
+        Pages that were fetched before are revalidated with a conditional GET, and the
+        cached HTML is reused when the server answers 304 Not Modified.
+        
+        Args:
+            url: The Domain.com.au property listing URL
             
-            # Parse the HTML
-            soup = BeautifulSoup(page_source, 'html.parser')
+        Returns:
+            The page HTML or None if the request failed
+        """
+        try:
+            cached = self._page_cache.get(url)
+            await asyncio.sleep(random.uniform(*(self.REVALIDATION_DELAY if cached else self.REQUEST_DELAY)))
             
-            # Extract property information
-            property_data = {
-                "basic_info": {
-                    "url": url,
-                    "title": self._get_text(soup, 'h3[data-testid="listing-details__description-headline"]'),
-                    "property_type": self._get_property_type(soup),
-                    "price": None  # Initialize price as None
-                },
-                "address": {
-                    "full_address": self._get_address(soup),
-                },
-                "features": {
-                    "bedrooms": self._get_feature_value(soup, "Bed"),
-                    "bathrooms": self._get_feature_value(soup, "Bath"),
-                    "parking": self._get_feature_value(soup, "Parking"),
-                    "property_size": self._clean_size(self._get_text(soup, '[data-testid="listing-details__floor-area"]')),
-                    "land_size": self._clean_size(self._get_text(soup, '[data-testid="listing-details__land-area"]')),
-                },
-                "description": self._get_text(soup, '[data-testid="listing-details__description"]'),
-                "agent_details": {
-                    "agency_name": self._get_text(soup, '[data-testid="listing-details__agent-agency-name"]'),
-                    "agent_name": self._get_text(soup, '[data-testid="listing-details__agent-enquiry-agent-profile-link"]'),
-                },
-                "inspection_times": self._get_inspection_times(soup),
-                "images": self._get_images(),  # Changed to use Selenium directly
-            }
+            response = await self.client.get(url, headers=cached[0] if cached else None)
+            if response.status_code == 304 and cached:
+                logger.debug("Listing page not modified: %s", url)
+                return cached[1]
+            response.raise_for_status()
             
-            # Try different price selectors
-            price_selectors = [
-                '[data-testid="listing-details__summary-title"]',
-                '[data-testid="listing-details__price"]',
-                '[data-testid="listing-details__price-text"]',
-                '.listing-price',
-            ]
-
-            # Try each selector until we find a valid price
-            for selector in price_selectors:
-                price_element = soup.select_one(selector)
-                if price_element:
-                    price = self._clean_price(price_element.get_text(strip=True))
-                    if price:  # Only set if we got a valid price
-                        property_data["basic_info"]["price"] = price
-                        break
+            validators = {}
+            if "ETag" in response.headers:
+                validators["If-None-Match"] = response.headers["ETag"]
+            if "Last-Modified" in response.headers:
+                validators["If-Modified-Since"] = response.headers["Last-Modified"]
+            if validators and len(response.text) <= self.PAGE_CACHE_MAX_CHARS:
+                self._page_cache[url] = (validators, response.text)
+            return response.text
             
-            return property_data
+        except Exception as e:
+            logger.error("Error fetching property page: %s", e)
+            return None
+
+    async def parse_listing(self, url: str, html: str) -> Optional[Dict]:
+        """
+        Extract property information from fetched listing HTML without collecting gallery images.
+        
+        When the page data has no description, the description shown on the page is cut
+        off behind a "Read more" button, so the full text is read with Selenium instead.
+        
+        Args:
+            url: The listing URL the HTML was fetched from
+            html: The server-rendered listing page
             
+        Returns:
+            Dictionary containing property details or None if parsing failed
+        """
+        try:
+            # Parsing and field extraction are CPU-bound, so they run off the event loop
+            property_data, complete_description = await asyncio.to_thread(self._parse_listing, url, html)
         except Exception as e:
-            logger.error(f"Error scraping property data: {e}")
+            logger.error("Error scraping property data: %s", e)
+            return None
+        
+        if not complete_description:
+            description = await self.get_full_description(url)
+            if description:
+                property_data["description"] = description
+        return property_data
+
+    def quick_address(self, html: str) -> Optional[str]:
+        """
+        Read the listing address straight from the raw page data, without a full parse.
+        
+        Lets callers start address-based work while the rest of the page is parsed.
+        Returns None when the address cannot be found this way.
+        """
+        match = _SUMMARY_ADDRESS_RE.search(html)
+        if not match:
+            return None
+        try:
+            return orjson.loads(match.group(1)) or None
+        except orjson.JSONDecodeError:
             return None
 
-    def _get_text(self, soup: BeautifulSoup, selector: str) -> str:
+    def _parse_listing(self, url: str, html: str) -> Tuple[Dict, bool]:
+        """
+        Extract property information from a listing page's HTML.
+        
+        Args:
+            url: The listing URL the HTML was fetched from
+            html: The server-rendered listing page
+            
+        Returns:
+            Dictionary containing property details, with empty images if the page data has
+            none, and whether the description came from the page data (and so is complete)
+        """
+        # Parse the HTML once and index its data-testid elements for the field lookups
+        soup = _ListingPage(html)
+        
+        # Prefer the structured listing embedded by Next.js, falling back to the DOM per field
+        next_data = self._get_next_data(soup)
+        listing = next(
+            (props for props in _find_values(next_data, "componentProps") if isinstance(props, dict)),
+            {}
+        )
+        summary = listing.get("listingSummary") or {}
+        description = listing.get("description")
+        if isinstance(description, list):
+            description = "\n".join(description)
+        images = self._get_images_from_next_data(next_data) if next_data else []
+        
+        # Extract property information
+        property_data = {
+            "basic_info": {
+                "url": url,
+                "title": listing.get("headline") or self._get_text(soup, 'h3[data-testid="listing-details__description-headline"]'),
+                "property_type": summary.get("propertyType") or self._get_property_type(soup),
+                "price": self._clean_price(summary.get("title") or "") or self._get_price(soup)
+            },
+            "address": {
+                "full_address": summary.get("address") or self._get_address(soup),
+            },
+            "features": {
+                "bedrooms": _or_else(summary.get("beds"), lambda: self._get_feature_value(soup, "Bed")),
+                "bathrooms": _or_else(summary.get("baths"), lambda: self._get_feature_value(soup, "Bath")),
+                "parking": _or_else(summary.get("parking"), lambda: self._get_feature_value(soup, "Parking")),
+                "property_size": self._clean_size(self._get_text(soup, '[data-testid="listing-details__floor-area"]')),
+                "land_size": self._clean_size(self._get_text(soup, '[data-testid="listing-details__land-area"]')),
+            },
+            "description": description or self._get_text(soup, '[data-testid="listing-details__description"]'),
+            "agent_details": {
+                "agency_name": self._get_text(soup, '[data-testid="listing-details__agent-agency-name"]'),
+                "agent_name": self._get_text(soup, '[data-testid="listing-details__agent-enquiry-agent-profile-link"]'),
+            },
+            "inspection_times": self._get_inspection_times(soup),
+            "images": images,
+        }
+        
+        return property_data, bool(description)
+
+    def _get_next_data(self, soup: _ListingPage) -> Optional[Dict]:
+        """Parse the embedded __NEXT_DATA__ JSON if the page has it."""
+        node = soup.tree.css_first('script#__NEXT_DATA__')
+        if not node:
+            return None
+        try:
+            return orjson.loads(node.text())
+        except ValueError as e:
+            logger.warning("Could not parse __NEXT_DATA__: %s", e)
+            return None
+
+    def _get_price(self, soup: _ListingPage) -> Optional[int]:
+        """Extract the price using multiple possible selectors."""
+        # Try each price selector until we find a valid price
+        for selector in _PRICE_SELECTORS:
+            price_element = soup.css_first(selector)
+            if price_element:
+                price = self._clean_price(price_element.text(strip=True))
+                if price:  # Only return if we got a valid price
+                    return price
+        return None
+
+    def _get_text(self, soup: _ListingPage, selector: str) -> str:
         """Extract text from an element if it exists."""
-        element = soup.select_one(selector)
+        element = soup.css_first(selector)
         if not element:
             return ""
         
-        return element.get_text("\n",strip=True)
+        return element.text(separator="\n", strip=True)
 
-    def _get_property_type(self, soup: BeautifulSoup) -> str:
+    def _get_property_type(self, soup: _ListingPage) -> str:
         """Extract property type using multiple possible selectors."""
-        # Try different possible selectors for property type
-        selectors = [
-            'div[data-testid="listing-summary-property-type"]',
-            'span[data-testid="property-features-feature-property_type"]',
-            'div.property-info__property-type'
-        ]
-        
-        for selector in selectors:
-            element = soup.select_one(selector)
+        for selector in _PROPERTY_TYPE_SELECTORS:
+            element = soup.css_first(selector)
             if element:
-                return element.get_text(strip=True)
+                return element.text(strip=True)
         return ""
 
-    def _get_address(self, soup: BeautifulSoup) -> str:
+    def _get_address(self, soup: _ListingPage) -> str:
         """Extract full address using multiple possible selectors."""
-        # Try different possible selectors for address
-        selectors = [
-            'h1[data-testid="listing-details__button-copy-link"]',
-            'div[data-testid="listing-details__button-copy-wrapper"]',
-            'div[data-testid="listing-summary-address"]',
-            'h1.property-info__address'
-        ]
-        
-        for selector in selectors:
-            element = soup.select_one(selector)
+        for selector in _ADDRESS_SELECTORS:
+            element = soup.css_first(selector)
             if element:
-                return element.get_text(strip=True)
+                return element.text(strip=True)
         return ""
 
-    def _get_feature_value(self, soup: BeautifulSoup, feature_name: str) -> Optional[int]:
+    def _get_feature_value(self, soup: _ListingPage, feature_name: str) -> Optional[int]:
         """
         Extract numeric feature value (beds, baths, parking) from the property features.
         Returns an integer or None if no valid number is found.
         
         Args:
-            soup: BeautifulSoup object
+            soup: Parsed listing page
             feature_name: Base name of the feature (e.g., "Bed" for "Bed" or "Beds")
         """
-        # Define variations of feature names
-        variations = {
-            "Bed": ["Bed", "Beds", "Bedroom", "Bedrooms"],
-            "Bath": ["Bath", "Baths", "Bathroom", "Bathrooms"],
-            "Parking": ["Parking", "Car Space", "Car Spaces", "Garage", "Garages"]
-        }
+        # Get the appropriate (lowercase) variations for the feature
+        feature_variations = _FEATURE_VARIATIONS.get(feature_name, (feature_name.lower(),))
         
-        # Get the appropriate variations for the feature
-        feature_variations = variations.get(feature_name, [feature_name])
+        spans = soup.spans
+        span_texts = [span.text(deep=False).lower() for span in spans]
         
         # Try each variation
         for variation in feature_variations:
             # Try to find the feature text
-            feature = soup.find('span', string=lambda text: text and variation.lower() in (text.lower() if text else ""))
-            if feature:
-                # First try to find the value in a previous sibling span
-                value = feature.find_previous('span')
-                if value:
-                    number = re.search(r'\d+', value.get_text(strip=True))
+            index = next(
+                (i for i, text in enumerate(span_texts) if variation in text),
+                None
+            )
+            if index is not None:
+                feature = spans[index]
+                # First try to find the value in the preceding span
+                if index > 0:
+                    number = _NUM_RE.search(spans[index - 1].text(strip=True))
                     if number:
                         return int(number.group())
                 
                 # If not found, try to find the number in the feature text itself
-                number = re.search(r'\d+', feature.get_text(strip=True))
+                number = _NUM_RE.search(feature.text(strip=True))
                 if number:
                     return int(number.group())
         
@@ -222,33 +423,13 @@ class DomainScraper:
         if not price_text:
             return None
         
-        try:
-            # Make sure we're dealing with a price string
-            if not any(char in price_text.lower() for char in ['$', 'price', 'from', 'offers']):
-                return None
-            
-            # Remove common price-related words
-            price_text = price_text.lower()
-            price_text = price_text.replace('from', '')
-            price_text = price_text.replace('offers above', '')
-            price_text = price_text.replace('offers over', '')
-            price_text = price_text.replace('guide', '')
-            
-            # Extract numbers, ensuring we have a dollar sign or price indicator
-            if '$' in price_text:
-                # Get the text after the dollar sign
-                price_part = price_text.split('$')[1].strip()
-                # Remove any text after numbers and decimals
-                price_part = ''.join(char for char in price_part if char.isdigit() or char == '.' or char == ',')
-                # Remove commas and convert to integer
-                if price_part:
-                    return int(price_part.replace(',', '').split('.')[0])
-            
-            return None
-            
-        except Exception as e:
-            print(f"Error cleaning price: {e}")
+        # Make sure we're dealing with a price string
+        if not _PRICE_HINT_RE.search(price_text):
             return None
+        
+        # Take the first dollar amount, ignoring cents and any trailing text
+        match = _PRICE_RE.search(price_text)
+        return int(match.group(1).replace(',', '')) if match else None
 
     def _clean_size(self, size_text: str) -> Optional[float]:
         """
@@ -259,7 +440,7 @@ class DomainScraper:
             return None
         
         # Extract the numeric value
-        number = re.search(r'[\d.]+', size_text)
+        number = _FLOAT_RE.search(size_text)
         if number:
             try:
                 return float(number.group())
@@ -267,39 +448,137 @@ class DomainScraper:
                 return None
         return None
 
-    def _get_inspection_times(self, soup: BeautifulSoup) -> list:
+    def _get_inspection_times(self, soup: _ListingPage) -> list:
         """Extract inspection times if available."""
         times = []
-        inspection_elements = soup.select('[data-testid="listing-details__inspection-time"]')
+        inspection_elements = soup.css('[data-testid="listing-details__inspection-time"]')
         for element in inspection_elements:
-            times.append(element.get_text(strip=True))
+            times.append(element.text(strip=True))
         return times
 
-    def _get_images(self) -> list:
-        """Extract property images using Selenium to handle dynamic loading."""
+    async def get_full_description(self, url: str) -> Optional[str]:
+        """
+        Read a listing's full description with Selenium, expanding it with its "Read more" button.
+        
+        Args:
+            url: The Domain.com.au property listing URL
+            
+        Returns:
+            The description text, or None if it could not be read
+        """
+        def expand_description() -> Optional[str]:
+            with self._driver_lock:
+                return self._expand_description(url)
+        
+        return await asyncio.to_thread(expand_description)
+
+    def _expand_description(self, url: str) -> Optional[str]:
+        """Load a listing in Selenium, click "Read more" if present and read the description."""
+        description_selector = '[data-testid="listing-details__description"]'
+        try:
+            self.driver.get(url)
+            description = self.driver.find_element(By.CSS_SELECTOR, description_selector)
+            truncated_length = len(description.text)
+            try:
+                WebDriverWait(self.driver, 3).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, f'{description_selector} button'))
+                ).click()
+                # Wait for the content to expand
+                WebDriverWait(self.driver, 3, ignored_exceptions=[StaleElementReferenceException]).until(
+                    lambda d: len(d.find_element(By.CSS_SELECTOR, description_selector).text) > truncated_length
+                )
+            except TimeoutException:
+                logger.debug("Description was not expanded for %s", url)
+            return self.driver.find_element(By.CSS_SELECTOR, description_selector).text.strip() or None
+        except Exception as e:
+            logger.warning("Could not read the full description for %s: %s", url, e)
+            return None
+
+    async def get_images(self, url: str) -> list:
+        """
+        Extract gallery images for a listing without blocking the event loop.
+        
+        Selenium is synchronous, so the gallery walk runs on a worker thread.
+        
+        Args:
+            url: The Domain.com.au property listing URL
+            
+        Returns:
+            List of image URLs
+        """
+        def walk_gallery() -> list:
+            with self._driver_lock:
+                return self._get_images(url)
+        
+        return await asyncio.to_thread(walk_gallery)
+
+    def _get_images(self, url: str) -> list:
+        """
+        Extract property images using Selenium to handle dynamic loading.
+        
+        The gallery is read from the page's embedded Next.js data in a single
+        script call. Walking the gallery slide by slide is only a fallback.
+        """
+        logger.info("Starting image extraction for %s", url)
+        try:
+            self.driver.get(url)
+            next_data = self.driver.execute_script(_NEXT_DATA_JS)
+            images = self._get_images_from_next_data(orjson.loads(next_data)) if next_data else []
+        except Exception as e:
+            logger.warning("Could not read gallery from page data: %s", e)
+            images = []
+        
+        if images:
+            logger.info("Found %d images in page data", len(images))
+            return images
+        
+        return self._walk_gallery()
+
+    def _get_images_from_next_data(self, next_data: Dict) -> list:
+        """
+        Extract gallery image URLs from a listing's __NEXT_DATA__ payload.
+        
+        Args:
+            next_data: Parsed __NEXT_DATA__ JSON
+            
+        Returns:
+            List of unique image URLs in gallery order
+        """
+        images = []
+        for gallery in _find_values(next_data, "gallery"):
+            if not isinstance(gallery, dict):
+                continue
+            for slide in gallery.get("slides") or []:
+                if slide.get("mediaType", "image") != "image":
+                    continue
+                src = ((slide.get("images") or {}).get("original") or {}).get("url")
+                if src and src not in images:
+                    images.append(src)
+            if images:
+                break
+        return images
+
+    def _walk_gallery(self) -> list:
+        """Extract images by clicking through the gallery of the currently loaded page."""
         images = []
         try:
-            logger.info("Starting image extraction process...")
             wait = WebDriverWait(self.driver, 10)
             
             # Find and click the Photos button
-            logger.info("Looking for Photos button...")
             photos_button = wait.until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, '[data-testid="listing-details__toolbar-icon photos"]'))
             )
-            logger.info("Found Photos button, clicking it...")
+            logger.debug("Found Photos button, clicking it")
             photos_button.click()
             
-            # Wait for the gallery to load
-            logger.info("Waiting for gallery to initialize...")
-            time.sleep(2)  # Give time for the gallery to initialize
+            # Wait for the gallery to show its first image
+            wait.until(EC.visibility_of_element_located((By.CSS_SELECTOR, 'img[class="pswp__img"]')))
             
             # Find the next button for navigation using its title
-            logger.info("Looking for Next button...")
             next_button = wait.until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, 'button[title="Next (arrow right)"]'))
             )
-            logger.info("Found Next button")
+            logger.debug("Found Next button")
             
             # Keep track of seen images to avoid duplicates
             seen_images = set()
@@ -308,63 +587,66 @@ class DomainScraper:
             
             while True:
                 image_count += 1
-                logger.info(f"\nProcessing image #{image_count}")
+                logger.debug("Processing image #%d", image_count)
                 
                 # Get all visible images and take the last one (rightmost)
-                logger.info("Looking for visible image elements...")
                 visible_images = self.driver.find_elements(By.CSS_SELECTOR, 'img[class="pswp__img"]')
                 if not visible_images:
-                    logger.info("No visible images found")
+                    logger.debug("No visible images found")
                     break
                     
                 # Get the last (rightmost) image
                 last_img = visible_images[-1]
                 src = last_img.get_attribute('src')
-                alt = last_img.get_attribute('alt')
-                logger.info(f"Processing last image - src: {src}, alt: {alt}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    # Reading alt is an extra WebDriver round trip, so only do it when logged
+                    logger.debug("Processing last image - src: %s, alt: %s", src, last_img.get_attribute('alt'))
                 
                 # Only add if we have a valid src and haven't seen it before
                 if src and src not in seen_images:
                     images.append(src)
                     seen_images.add(src)
                     no_new_images_count = 0  # Reset counter when we find a new image
-                    logger.info(f"Added new image to collection. Total unique images: {len(images)}")
+                    logger.debug("Added new image to collection. Total unique images: %d", len(images))
                 else:
                     no_new_images_count += 1
-                    logger.info(f"No new image found. Consecutive no-new-images count: {no_new_images_count}")
+                    logger.debug("No new image found. Consecutive no-new-images count: %d", no_new_images_count)
                 
                 # If we haven't found any new images in 5 consecutive attempts, we're done
                 if no_new_images_count >= 5:
-                    logger.info("No new images found in 5 consecutive attempts - finished with gallery")
+                    logger.debug("No new images found in 5 consecutive attempts - finished with gallery")
                     break
                 
                 # Try to click next button
                 try:
-                    logger.info("Attempting to click Next button...")
                     next_button.click()
-                    logger.info("Successfully clicked Next button")
-                    time.sleep(0.5)  # Wait for the next image to load
                 except Exception as e:
-                    logger.info(f"Could not click Next button: {str(e)}")
-                    logger.info("Reached end of gallery")
+                    logger.debug("Could not click Next button, reached end of gallery: %s", e)
+                    break
+                
+                # Wait until the gallery shows a different image rather than sleeping a fixed time
+                try:
+                    WebDriverWait(self.driver, 3, ignored_exceptions=[StaleElementReferenceException]).until(
+                        lambda d: any(
+                            img.get_attribute('src') != src
+                            for img in d.find_elements(By.CSS_SELECTOR, 'img[class="pswp__img"]')[-1:]
+                        )
+                    )
+                except TimeoutException:
+                    logger.debug("Gallery did not advance, reached end of gallery")
                     break
             
-            logger.info(f"\nImage extraction complete:")
-            logger.info(f"Total images processed: {image_count}")
-            logger.info(f"Total unique images found: {len(images)}")
+            logger.info("Image extraction complete: %d images processed, %d unique images found", image_count, len(images))
             
             # Close the gallery modal
-            logger.info("Looking for close button...")
             close_button = wait.until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, '[data-testid="pswp-header-btn-close"]'))
             )
-            logger.info("Found close button, clicking it...")
             close_button.click()
-            logger.info("Gallery closed successfully")
+            logger.debug("Gallery closed")
             
         except Exception as e:
-            logger.error(f"Error in image extraction: {str(e)}")
-            logger.error("Full error details:", exc_info=True)
+            logger.error("Error in image extraction: %s", e, exc_info=True)
         
         return images
 
@@ -382,11 +664,11 @@ class DomainScraper:
         output_file = f"outputs/{filename}_raw_{timestamp}.json"
         
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
-            print(f"✓ Raw data saved to {output_file}")
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+            logger.info("Raw data saved to %s", output_file)
         except Exception as e:
-            print(f"⚠ Error saving raw data: {e}")
+            logger.error("Error saving raw data: %s", e)
 
 
 
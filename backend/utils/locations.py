@@ -1,19 +1,44 @@
 """
 Contains a list of important locations to calculate distances from properties.
 These locations represent key necessities for daily life.
+
+The locations are read from locations.json once at import time into immutable
+Anchor records, grouped by category.
 """
 
-LOCATIONS = {
-    "work": [
-        "Wynard Station Sydney, NSW",  # Major business district
-    ],
-    "groceries": [
-        "Woolworths",  # Will be appended with suburb from property
-        "Coles",       # Will be appended with suburb from property
-        "Aldi",        # Will be appended with suburb from property
-        "IGA"         # Will be appended with suburb from property
-    ],
-    "schools": [
-        "Sydney Grammar School, College Street, Darlinghurst",
-    ]
-} 
\ No newline at end of file
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Tuple
+
+@dataclass(frozen=True, slots=True)
+class Anchor:
+    """
+    A point of interest that distances are calculated to.
+    
+    Attributes:
+        category: Location category (e.g. "work", "groceries")
+        template: Address of the location, or the store chain name for groceries
+    """
+    category: str
+    template: str
+
+def _load_anchors() -> Tuple[Anchor, ...]:
+    """Build the anchor records from locations.json, in file order."""
+    with open(Path(__file__).with_name("locations.json"), 'r') as f:
+        locations = json.load(f)
+    return tuple(
+        Anchor(sys.intern(category), name)
+        for category, names in locations.items()
+        for name in names
+    )
+
+ANCHORS: Tuple[Anchor, ...] = _load_anchors()
+
+# Anchors grouped by category, in file order
+ANCHORS_BY_CATEGORY: Mapping[str, Tuple[Anchor, ...]] = MappingProxyType({
+    category: tuple(anchor for anchor in ANCHORS if anchor.category == category)
+    for category in dict.fromkeys(anchor.category for anchor in ANCHORS)
+})
@@ -0,0 +1,137 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Optional
+
+import orjson
+import pytest
+from dotenv import load_dotenv
+
+# Add the project root directory to the Python path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+# Load environment variables once, before the backend or any test module is imported
+load_dotenv(project_root / "config" / ".env")
+
+from backend.services.cache import PropertyCache
+from backend.services.scraper import DomainScraper
+
+TEST_RESULTS_DIR = project_root / "test_results"
+REQUIRED_ENV_VARS = ("GEMINI_API_KEY", "GOOGLE_MAP_API_KEY")
+
+class ResultCache:
+    """
+    Scraped and distance results reused across test runs for a day, so the live service
+    tests do not call Domain.com.au and Google Maps on every run.
+    
+    Entries are versioned with the matching PropertyCache schema version, so results in an
+    old shape are not replayed. Set REFRESH_TEST_CACHE=1 to refetch.
+    """
+    MAX_AGE = 24 * 3600
+    VERSIONS = {
+        "property_data": PropertyCache.PROPERTY_SCHEMA_VERSION,
+        "distance_info": PropertyCache.DISTANCE_SCHEMA_VERSION
+    }
+    
+    def _path(self, name: str, key: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()[:12]
+        return TEST_RESULTS_DIR / f"cache_{name}_v{self.VERSIONS[name]}_{digest}.json"
+    
+    def load(self, name: str, key: str) -> Optional[Dict[str, Any]]:
+        """Load a result cached by an earlier test run, if it is fresh enough."""
+        path = self._path(name, key)
+        if os.getenv("REFRESH_TEST_CACHE") or not path.exists():
+            return None
+        if time.time() - path.stat().st_mtime > self.MAX_AGE:
+            return None
+        logging.getLogger(__name__).info("Using cached %s result from %s", name, path)
+        return orjson.loads(path.read_bytes())
+    
+    def save(self, name: str, key: str, data: Dict[str, Any]) -> None:
+        """Cache a result for later test runs; empty results usually mean a service failed, so they are not cached."""
+        if not data:
+            return
+        TEST_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        self._path(name, key).write_bytes(orjson.dumps(data))
+
+def pytest_configure(config):
+    """Pick one run id per pytest invocation for the test result directories."""
+    # Set before any test module is imported; pytest-xdist workers inherit it from this process
+    os.environ.setdefault("TEST_RUN_ID", datetime.now().strftime('%Y%m%d_%H%M%S'))
+    # Test modules read this at import to choose how test result JSON is written
+    if config.getoption("--pretty-artifacts"):
+        os.environ["PRETTY_ARTIFACTS"] = "1"
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--no-mock-external",
+        action="store_true",
+        default=False,
+        help="Call Domain.com.au and Google Maps in the route tests instead of replaying recorded responses"
+    )
+    parser.addoption(
+        "--record-external",
+        action="store_true",
+        default=False,
+        help="Call Domain.com.au and Google Maps in the route tests and save their responses to tests/fixtures"
+    )
+    parser.addoption(
+        "--pretty-artifacts",
+        action="store_true",
+        default=False,
+        help="Indent the JSON files written to test_results (compact by default)"
+    )
+
+@pytest.fixture(scope="session", autouse=True)
+def test_log_file():
+    """Write the log records of the whole test run to one file in test_results."""
+    TEST_RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.FileHandler(TEST_RESULTS_DIR / f"test_run_{os.environ['TEST_RUN_ID']}.log")
+    file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(file_handler)
+    yield
+    root_logger.removeHandler(file_handler)
+    file_handler.close()
+
+@pytest.fixture(scope="session", autouse=True)
+def route_cache_path(tmp_path_factory):
+    """Keep the route store written by the tests out of the user's cache directory."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("ROUTE_CACHE_PATH", str(tmp_path_factory.mktemp("route_cache") / "routes.db"))
+        yield
+
+@pytest.fixture(scope="session")
+def result_cache():
+    """Cache of scraped and distance results shared between test runs."""
+    return ResultCache()
+
+@pytest.fixture(scope="session")
+def env():
+    """Required API keys, read once per test session (None when not set)."""
+    return MappingProxyType({var: os.getenv(var) for var in REQUIRED_ENV_VARS})
+
+@pytest.fixture(scope="session")
+def session_loop():
+    """Event loop shared by session-scoped async services, whose HTTP clients are bound to one loop."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+@pytest.fixture(scope="session")
+def domain_scraper(session_loop):
+    """One DomainScraper for the test session, so its HTTP client and WebDriver are reused across tests."""
+    scraper = DomainScraper()
+    yield scraper
+    session_loop.run_until_complete(scraper.close())
@@ -5,13 +5,14 @@ Each test builds upon the results of previous tests.
 """
 
 import os
-import json
+import orjson
+import asyncio
+import zipfile
 from datetime import datetime
 import sys
 from pathlib import Path
 import time
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
 import logging
 import pytest
 
@@ -20,7 +21,6 @@ project_root = str(Path(__file__).parent.parent)
 sys.path.append(project_root)
 
 from backend.agents.negative_nancy import NegativeNancy
-from backend.services.scraper import DomainScraper
 from backend.services.map import DistanceCalculator
 
 # Configure logging
@@ -30,28 +30,22 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv(project_root + '/config/.env')
-
 # Test configuration
 TEST_PROPERTY_URL = "https://www.domain.com.au/1-henry-kendall-crescent-mascot-nsw-2020-2019711647"
 TEST_RESULTS_DIR = Path(project_root) / "test_results"
-TEST_RUN_DIR = TEST_RESULTS_DIR / f"test_agent_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+# Shared by every module and worker in a pytest run (see conftest.py)
+TEST_RUN_ID = os.getenv("TEST_RUN_ID") or datetime.now().strftime('%Y%m%d_%H%M%S')
+TEST_RUN_DIR = TEST_RESULTS_DIR / f"test_agent_{TEST_RUN_ID}"
+# Test result JSON is compact unless pytest runs with --pretty-artifacts (see conftest.py)
+ARTIFACT_JSON_OPTION = orjson.OPT_INDENT_2 if os.getenv("PRETTY_ARTIFACTS") else 0
 
 # Create test results directory
 TEST_RUN_DIR.mkdir(parents=True, exist_ok=True)
 
-# Configure file logging
-file_handler = logging.FileHandler(TEST_RUN_DIR / "test_agent.log")
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-logger.addHandler(file_handler)
-
-def save_test_data(data: Dict[str, Any], filename: str) -> None:
-    """Save test data to a JSON file."""
-    filepath = TEST_RUN_DIR / filename
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
-    logger.info(f"Saved test data to {filepath}")
+def save_test_data(test_state: "StateManager", data: Dict[str, Any], filename: str) -> None:
+    """Save test data as a JSON file in the test run's artifacts.zip."""
+    test_state.artifact_zip.writestr(filename, orjson.dumps(data, option=ARTIFACT_JSON_OPTION))
+    logger.info("Saved test data to %s in %s", filename, test_state.artifact_zip.filename)
 
 class StateManager:
     """Class to maintain state between tests."""
@@ -60,48 +54,50 @@ class StateManager:
         self.distance_info: Optional[Dict[str, Any]] = None
         self.agent: Optional[NegativeNancy] = None
         self.analysis_result: Optional[Dict[str, Any]] = None
+        self.artifact_zip: Optional[zipfile.ZipFile] = None
 
 @pytest.fixture(scope="session")
 def test_state():
-    """Create a test state object to share between tests."""
-    return StateManager()
+    """Create a test state object to share between tests, with one archive for the saved test data."""
+    state = StateManager()
+    with zipfile.ZipFile(TEST_RUN_DIR / "artifacts.zip", "w", zipfile.ZIP_DEFLATED) as state.artifact_zip:
+        yield state
 
-def test_01_environment_setup(test_state):
+def test_01_environment_setup(test_state, env):
     """Test that all required environment variables are set."""
     logger.info("Testing environment setup...")
     
-    required_vars = {
-        "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY"),
-        "GOOGLE_MAP_API_KEY": os.getenv("GOOGLE_MAP_API_KEY")
-    }
-    
-    missing_vars = [var for var, value in required_vars.items() if not value]
+    missing_vars = [var for var, value in env.items() if not value]
     if missing_vars:
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
     
     logger.info("✓ Environment setup successful")
-    save_test_data({"status": "success", "message": "Environment setup successful"}, "01_environment_setup.json")
+    save_test_data(test_state, {"status": "success", "message": "Environment setup successful"}, "01_environment_setup.json")
 
-def test_02_domain_scraper(test_state):
+def test_02_domain_scraper(test_state, domain_scraper, session_loop, result_cache):
     """Test the Domain scraper with the test property URL."""
     logger.info("Testing Domain scraper...")
     
     try:
-        scraper = DomainScraper()
-        property_data = scraper.get_property_data(TEST_PROPERTY_URL)
-        
-        if not property_data:
-            raise ValueError("Failed to fetch property data")
+        property_data = result_cache.load("property_data", TEST_PROPERTY_URL)
+        if property_data is None:
+            property_data = session_loop.run_until_complete(domain_scraper.get_property_data(TEST_PROPERTY_URL))
+            
+            if not property_data:
+                raise ValueError("Failed to fetch property data")
+            # Listings without images may have hit a gallery failure, so they are fetched again next run
+            if property_data.get("images"):
+                result_cache.save("property_data", TEST_PROPERTY_URL, property_data)
         
         test_state.property_data = property_data
         logger.info("✓ Domain scraper test successful")
-        save_test_data(property_data, "02_domain_scraper.json")
+        save_test_data(test_state, property_data, "02_domain_scraper.json")
         
     except Exception as e:
-        logger.error(f"Domain scraper test failed: {str(e)}")
+        logger.exception("Domain scraper test failed: %s", e)
         raise
 
-def test_03_distance_calculator(test_state):
+def test_03_distance_calculator(test_state, env, result_cache):
     """Test the distance calculator with the scraped property data."""
     logger.info("Testing distance calculator...")
     
@@ -109,24 +105,33 @@ def test_03_distance_calculator(test_state):
         raise ValueError("Property data not available from previous test")
     
     try:
-        distance_calc = DistanceCalculator(os.getenv("GOOGLE_MAP_API_KEY"))
         address = test_state.property_data["address"]["full_address"]
-        distance_info = distance_calc.calculate_distances(address)
+        distance_info = result_cache.load("distance_info", address)
+        if distance_info is None:
+            async def calculate_distances():
+                distance_calc = DistanceCalculator(env["GOOGLE_MAP_API_KEY"])
+                try:
+                    return await distance_calc.calculate_distances(address)
+                finally:
+                    await distance_calc.close()
+            
+            distance_info = asyncio.run(calculate_distances())
+            result_cache.save("distance_info", address, distance_info)
         
         test_state.distance_info = distance_info
         logger.info("✓ Distance calculator test successful")
-        save_test_data(distance_info, "03_distance_calculator.json")
+        save_test_data(test_state, distance_info, "03_distance_calculator.json")
         
     except Exception as e:
-        logger.error(f"Distance calculator test failed: {str(e)}")
+        logger.exception("Distance calculator test failed: %s", e)
         raise
 
-def test_04_negative_nancy_initialization(test_state):
+def test_04_negative_nancy_initialization(test_state, env):
     """Test the NegativeNancy initialization."""
     logger.info("Testing NegativeNancy initialization...")
     
     try:
-        agent = NegativeNancy(os.getenv("GEMINI_API_KEY"))
+        agent = NegativeNancy(env["GEMINI_API_KEY"])
         test_state.agent = agent
         
         # Verify agent attributes
@@ -139,10 +144,10 @@ def test_04_negative_nancy_initialization(test_state):
         assert agent.persona_file == 'negative_nancy.txt'
         
         logger.info("✓ NegativeNancy initialization successful")
-        save_test_data({"status": "success", "message": "NegativeNancy initialized successfully"}, "04_negative_nancy_init.json")
+        save_test_data(test_state, {"status": "success", "message": "NegativeNancy initialized successfully"}, "04_negative_nancy_init.json")
         
     except Exception as e:
-        logger.error(f"NegativeNancy initialization failed: {str(e)}")
+        logger.exception("NegativeNancy initialization failed: %s", e)
         raise
 
 def test_05_property_analysis(test_state):
@@ -161,14 +166,14 @@ def test_05_property_analysis(test_state):
         
         test_state.analysis_result = result
         logger.info("✓ Property analysis successful")
-        save_test_data(result, "05_property_analysis.json")
+        save_test_data(test_state, result, "05_property_analysis.json")
         
         # Verify the analysis contains negative aspects
         assert "concerns" in result or "risks" in result or "issues" in result
         logger.info("✓ Analysis contains expected negative aspects")
         
     except Exception as e:
-        logger.error(f"Property analysis failed: {str(e)}")
+        logger.exception("Property analysis failed: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+"""
+Unit tests for the in-memory property cache used when REDIS_URL is not configured.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from backend.services.cache import PropertyCache
+
+ADDRESS = "1 Henry Kendall Crescent, Mascot NSW 2020"
+PROPERTY_DATA = {
+    "basic_info": {"url": "https://www.domain.com.au/listing", "price": 1500000},
+    "address": {"full_address": ADDRESS},
+    "images": ["https://example.com/1.jpg"],
+}
+
+def run(coro):
+    """Run a cache coroutine on a fresh event loop."""
+    return asyncio.run(coro)
+
+def test_property_data_round_trip():
+    cache = PropertyCache()
+    url = PROPERTY_DATA["basic_info"]["url"]
+
+    assert run(cache.get_property_data(url)) is None
+    run(cache.set_property_data(url, PROPERTY_DATA))
+
+    assert run(cache.get_property_data(url)) == PROPERTY_DATA
+    assert run(cache.get_property_data("https://www.domain.com.au/other")) is None
+
+def test_property_data_is_copied():
+    cache = PropertyCache()
+    url = PROPERTY_DATA["basic_info"]["url"]
+    run(cache.set_property_data(url, PROPERTY_DATA))
+
+    # Changing a returned copy must not change the cached entry
+    cached = run(cache.get_property_data(url))
+    cached["images"].append("https://example.com/2.jpg")
+
+    assert run(cache.get_property_data(url)) == PROPERTY_DATA
+
+def test_distance_info_is_cached_per_category():
+    cache = PropertyCache()
+    work = [{"destination": "Sydney NSW 2000", "distance": {"text": "10 min", "value": 600}}]
+    run(cache.set_distance_info(ADDRESS, {"work": work}))
+
+    # Only the cached categories are returned
+    assert run(cache.get_distance_info(ADDRESS, ["work", "groceries"])) == {"work": work}
+    assert run(cache.get_distance_info(ADDRESS, ["groceries"])) == {}
+    assert run(cache.get_distance_info(ADDRESS, [])) == {}
+    assert run(cache.get_distance_info("2 Other Street, Mascot NSW 2020", ["work"])) == {}
+
+def test_keys_include_schema_versions(monkeypatch):
+    cache = PropertyCache()
+    url = PROPERTY_DATA["basic_info"]["url"]
+    run(cache.set_property_data(url, PROPERTY_DATA))
+    run(cache.set_distance_info(ADDRESS, {"work": [{"destination": "Sydney NSW 2000"}]}))
+
+    assert cache._property_key(url).startswith(f"prop:v{PropertyCache.PROPERTY_SCHEMA_VERSION}:")
+    assert cache._distance_key(ADDRESS, "work").startswith(f"dist:v{PropertyCache.DISTANCE_SCHEMA_VERSION}:")
+
+    # Entries written in an older shape are ignored once the version is bumped
+    monkeypatch.setattr(cache, "PROPERTY_SCHEMA_VERSION", PropertyCache.PROPERTY_SCHEMA_VERSION + 1)
+    monkeypatch.setattr(cache, "DISTANCE_SCHEMA_VERSION", PropertyCache.DISTANCE_SCHEMA_VERSION + 1)
+    assert run(cache.get_property_data(url)) is None
+    assert run(cache.get_distance_info(ADDRESS, ["work"])) == {}
+
+def test_session_updates_are_merged():
+    cache = PropertyCache()
+
+    assert run(cache.get_session("missing")) is None
+    run(cache.update_session("session-1", {"url": PROPERTY_DATA["basic_info"]["url"], "status": "pending"}))
+    run(cache.update_session("session-1", {"status": "complete", "property_data": PROPERTY_DATA}))
+
+    assert run(cache.get_session("session-1")) == {
+        "url": PROPERTY_DATA["basic_info"]["url"],
+        "status": "complete",
+        "property_data": PROPERTY_DATA,
+    }
+
+    # The returned session is a copy
+    run(cache.get_session("session-1"))["status"] = "failed"
+    assert run(cache.get_session("session-1"))["status"] == "complete"
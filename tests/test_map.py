@@ -0,0 +1,170 @@
+"""
+Unit tests for the Google Maps distance calculator, run against a mock transport.
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import orjson
+import pytest
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from backend.services.map import DistanceCalculator
+from backend.utils.locations import Anchor
+
+def make_calculator(handler) -> DistanceCalculator:
+    """A distance calculator whose Google API requests are answered by handler."""
+    calculator = DistanceCalculator("test-key")
+    calculator.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    calculator.RETRY_BACKOFF_SECONDS = 0
+    return calculator
+
+def run(calculator: DistanceCalculator, coro):
+    """Run a calculator coroutine, closing the calculator afterwards."""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await calculator.close()
+    return asyncio.run(main())
+
+def matrix_handler(requests, durations=None):
+    """
+    Answer route matrix requests with a route to every destination, recording each request body.
+    
+    Durations are looked up by destination address, defaulting to 600 seconds.
+    """
+    durations = durations or {}
+    
+    def handler(request):
+        body = orjson.loads(request.content)
+        requests.append(body)
+        destinations = [destination["waypoint"]["address"] for destination in body["destinations"]]
+        return httpx.Response(200, json=[
+            {
+                "originIndex": 0,
+                "destinationIndex": i,
+                "condition": "ROUTE_EXISTS",
+                "duration": f"{durations.get(destination, 600)}s",
+            }
+            for i, destination in enumerate(destinations)
+        ])
+    return handler
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_post_retries_throttled_and_server_errors(status):
+    statuses = [status, status, 200]
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(statuses[len(requests) - 1], json={"places": []})
+    
+    calculator = make_calculator(handler)
+    response = run(calculator, calculator._post(calculator.places_url, {"textQuery": "Coles"}, "places.formattedAddress"))
+    
+    assert response.status_code == 200
+    assert len(requests) == 3
+    assert requests[0].headers["X-Goog-Api-Key"] == "test-key"
+    assert requests[0].headers["X-Goog-FieldMask"] == "places.formattedAddress"
+
+def test_post_gives_up_after_max_retries():
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+    
+    calculator = make_calculator(handler)
+    with pytest.raises(httpx.HTTPStatusError):
+        run(calculator, calculator._post(calculator.places_url, {}, "places.formattedAddress"))
+    
+    assert len(requests) == DistanceCalculator.MAX_RETRIES + 1
+
+def test_post_does_not_retry_client_errors():
+    requests = []
+    
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(400, json={"error": {"message": "Invalid request"}})
+    
+    calculator = make_calculator(handler)
+    with pytest.raises(httpx.HTTPStatusError) as excinfo:
+        run(calculator, calculator._post(calculator.places_url, {}, "places.formattedAddress"))
+    
+    assert excinfo.value.response.status_code == 400
+    assert len(requests) == 1
+
+def test_travel_times_are_requested_in_chunks():
+    requests = []
+    calculator = make_calculator(matrix_handler(requests, {"Destination 29": 1200}))
+    calculator._route_store = None
+    destinations = [f"Destination {i}" for i in range(30)]
+    
+    travel_times = run(calculator, calculator._get_travel_times(
+        "Origin", destinations, "DRIVE", "current", datetime(2024, 5, 6, 12, 0)
+    ))
+    
+    assert [len(body["destinations"]) for body in requests] == [DistanceCalculator.MAX_MATRIX_DESTINATIONS, 5]
+    assert travel_times == [600] * 29 + [1200]
+
+def test_travel_times_are_cached():
+    requests = []
+    calculator = make_calculator(matrix_handler(requests))
+    calculator._route_store = None
+    departure_time = datetime(2024, 5, 6, 12, 0)
+    
+    async def main():
+        await calculator._get_travel_times("Origin", ["A Street", "B Street"], "DRIVE", "current", departure_time)
+        # Spelling variants of cached destinations are not requested again
+        return await calculator._get_travel_times("origin", ["a street.", "B Street", "C Street"], "DRIVE", "current", departure_time)
+    
+    travel_times = run(calculator, main())
+    
+    assert travel_times == [600, 600, 600]
+    assert [len(body["destinations"]) for body in requests] == [2, 1]
+    assert requests[1]["destinations"] == [{"waypoint": {"address": "C Street"}}]
+
+def test_destinations_are_deduplicated_across_categories():
+    requests = []
+    calculator = make_calculator(matrix_handler(requests))
+    calculator._route_store = None
+    calculator.anchors = {
+        "work": (Anchor("work", "Sydney NSW 2000"),),
+        "health": (Anchor("health", "sydney, NSW 2000"), Anchor("health", "Mascot NSW 2020")),
+    }
+    calculator.category_plan = calculator._build_category_plan()
+    calculator.categories = tuple(calculator.category_plan)
+    
+    distances = run(calculator, calculator.calculate_distances("Origin"))
+    
+    # One request per (travel mode, departure slot), each destination requested once:
+    # current legs cover both places, peak legs only the work location
+    destination_counts = sorted(len(body["destinations"]) for body in requests)
+    assert destination_counts == [1, 1, 1, 1, 2, 2]
+    
+    # Both spellings get the shared route back under their own name
+    assert [route["destination"] for route in distances["work"]] == ["Sydney NSW 2000"]
+    assert [route["destination"] for route in distances["health"]] == ["sydney, NSW 2000", "Mascot NSW 2020"]
+    assert distances["work"][0]["modes"]["driving"]["morning_peak"]["value"] == 600
+
+@pytest.mark.parametrize("slot, departure_time, expected", [
+    ("current", datetime(2024, 5, 6, 8, 30), "morning_peak"),  # Monday morning
+    ("current", datetime(2024, 5, 6, 17, 0), "evening_peak"),  # Monday evening
+    ("current", datetime(2024, 5, 6, 12, 0), "off_peak"),
+    ("current", datetime(2024, 5, 11, 8, 30), "off_peak"),  # Saturday morning
+    ("morning_peak", datetime(2024, 5, 6, 12, 0), "morning_peak"),
+])
+def test_store_slot(slot, departure_time, expected):
+    assert DistanceCalculator._store_slot(slot, departure_time) == expected
+
+def test_format_duration_and_distance():
+    assert DistanceCalculator._format_duration(45 * 60) == "45 min"
+    assert DistanceCalculator._format_duration(2 * 3600 + 30 * 60) == "2 hr 30 min"
+    assert DistanceCalculator._format_distance(5230) == "5.2 km"
@@ -0,0 +1,160 @@
+"""
+Unit tests for the property initialization pipeline, run against fake services.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from backend.pipeline import PropertyFetchError, analyze
+from backend.services.cache import PropertyCache
+
+URL = "https://www.domain.com.au/1-henry-kendall-crescent-mascot-nsw-2020-2019000000"
+ADDRESS = "1 Henry Kendall Crescent, Mascot NSW 2020"
+WORK_ROUTE = {"destination": "Sydney NSW 2000", "distance": {"text": "10 min", "value": 600}}
+
+class FakeScraper:
+    """Scraper returning canned listing data, recording the calls made to it."""
+
+    def __init__(self, html="<html></html>", address=ADDRESS, images=("https://example.com/1.jpg",)):
+        self.html = html
+        self.address = address
+        self.images = list(images)
+        self.calls = []
+
+    async def fetch_listing(self, url):
+        self.calls.append("fetch_listing")
+        return self.html
+
+    def quick_address(self, html):
+        self.calls.append("quick_address")
+        return self.address
+
+    async def parse_listing(self, url, html):
+        self.calls.append("parse_listing")
+        return {"basic_info": {"url": url}, "address": {"full_address": ADDRESS}, "images": []}
+
+    async def get_images(self, url):
+        self.calls.append("get_images")
+        return self.images
+
+class FakeDistanceCalculator:
+    """Distance calculator with routes for the work category only."""
+
+    categories = ("work", "groceries")
+
+    def __init__(self):
+        self.requests = []
+
+    async def calculate_distances(self, address, categories):
+        self.requests.append((address, list(categories)))
+        return {category: [WORK_ROUTE] if category == "work" else [] for category in categories}
+
+def make_services(scraper=None) -> SimpleNamespace:
+    """Services with the fake scraper and distance calculator and an in-memory cache."""
+    return SimpleNamespace(
+        scraper=scraper or FakeScraper(),
+        distance_calculator=FakeDistanceCalculator(),
+        cache=PropertyCache()
+    )
+
+def test_analyze_scrapes_and_caches_listing():
+    services = make_services()
+
+    async def main():
+        result = await analyze(URL, services=services)
+        return result, await services.cache.get_property_data(URL)
+
+    result, cached = asyncio.run(main())
+
+    assert result.property_data["images"] == ["https://example.com/1.jpg"]
+    assert result.distance_info == {"work": [WORK_ROUTE]}
+    assert cached == result.property_data
+    # Distances start from the address in the raw page, before the listing is parsed
+    assert services.scraper.calls.index("quick_address") < services.scraper.calls.index("parse_listing")
+    assert services.distance_calculator.requests == [(ADDRESS, ["work", "groceries"])]
+
+def test_analyze_uses_cached_listing():
+    services = make_services()
+    cached = {"basic_info": {"url": URL}, "address": {"full_address": ADDRESS}, "images": ["cached.jpg"]}
+
+    async def main():
+        await services.cache.set_property_data(URL, cached)
+        return await analyze(URL, ["work"], services=services)
+
+    result = asyncio.run(main())
+
+    assert result.property_data == cached
+    assert result.distance_info == {"work": [WORK_ROUTE]}
+    assert services.scraper.calls == []
+
+def test_analyze_reuses_cached_distances():
+    services = make_services()
+
+    async def main():
+        await services.cache.set_distance_info(ADDRESS, {"work": [WORK_ROUTE]})
+        return await analyze(URL, ["work", "groceries"], services=services)
+
+    result = asyncio.run(main())
+
+    assert result.distance_info == {"work": [WORK_ROUTE]}
+    # Only the category missing from the cache is calculated
+    assert services.distance_calculator.requests == [(ADDRESS, ["groceries"])]
+
+def test_analyze_does_not_cache_empty_categories():
+    services = make_services()
+
+    async def main():
+        await analyze(URL, ["work", "groceries"], services=services)
+        return await services.cache.get_distance_info(ADDRESS, ["work", "groceries"])
+
+    assert asyncio.run(main()) == {"work": [WORK_ROUTE]}
+
+def test_analyze_does_not_cache_listing_without_images():
+    services = make_services(FakeScraper(images=()))
+
+    async def main():
+        result = await analyze(URL, services=services)
+        return result, await services.cache.get_property_data(URL)
+
+    result, cached = asyncio.run(main())
+
+    assert result.property_data["images"] == []
+    assert cached is None
+
+def test_analyze_without_images():
+    services = make_services()
+
+    async def main():
+        result = await analyze(URL, services=services, include_images=False)
+        return result, await services.cache.get_property_data(URL)
+
+    result, cached = asyncio.run(main())
+
+    assert "get_images" not in services.scraper.calls
+    assert result.distance_info == {"work": [WORK_ROUTE]}
+    assert cached is None
+
+def test_analyze_falls_back_to_parsed_address():
+    services = make_services(FakeScraper(address=None))
+
+    result = asyncio.run(analyze(URL, ["work"], services=services))
+
+    assert result.distance_info == {"work": [WORK_ROUTE]}
+    assert services.distance_calculator.requests == [(ADDRESS, ["work"])]
+
+def test_analyze_raises_when_fetch_fails():
+    services = make_services(FakeScraper(html=None))
+
+    with pytest.raises(PropertyFetchError):
+        asyncio.run(analyze(URL, services=services))
+
+    assert services.scraper.calls == ["fetch_listing"]
+    assert services.distance_calculator.requests == []
@@ -0,0 +1,73 @@
+"""
+Unit tests for the on-disk route travel time store.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the project root directory to the Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from backend.services import route_store
+from backend.services.route_store import RouteStore
+
+ROUTE = ("1 henry kendall crescent mascot nsw 2020", "wynyard station sydney nsw", "DRIVE", "off_peak")
+OTHER_ROUTE = ("1 henry kendall crescent mascot nsw 2020", "wynyard station sydney nsw", "TRANSIT", "off_peak")
+
+@pytest.fixture
+def store(tmp_path):
+    """A route store in a fresh database file."""
+    store = RouteStore(str(tmp_path / "routes.db"))
+    yield store
+    store.close()
+
+def test_get_many_returns_stored_times_in_key_order(store):
+    store.set_many([(ROUTE, 1260), (OTHER_ROUTE, 2016)])
+    
+    assert store.get_many([OTHER_ROUTE, ROUTE]) == [2016, 1260]
+    assert store.get_many([]) == []
+
+def test_missing_routes_are_none(store):
+    store.set_many([(ROUTE, 1260)])
+    
+    assert store.get_many([OTHER_ROUTE, ROUTE]) == [None, 1260]
+
+def test_set_many_replaces_existing_times(store):
+    store.set_many([(ROUTE, 1260)])
+    store.set_many([(ROUTE, 1500)])
+    
+    assert store.get_many([ROUTE]) == [1500]
+
+def test_expired_routes_are_not_returned(store, monkeypatch):
+    now = 1_700_000_000.0
+    monkeypatch.setattr(route_store.time, "time", lambda: now)
+    store.set_many([(ROUTE, 1260)])
+    
+    monkeypatch.setattr(route_store.time, "time", lambda: now + RouteStore.ROUTE_TTL - 1)
+    assert store.get_many([ROUTE]) == [1260]
+    
+    monkeypatch.setattr(route_store.time, "time", lambda: now + RouteStore.ROUTE_TTL + 1)
+    assert store.get_many([ROUTE]) == [None]
+
+def test_routes_persist_across_connections(tmp_path):
+    path = str(tmp_path / "routes.db")
+    first = RouteStore(path)
+    first.set_many([(ROUTE, 1260)])
+    first.close()
+    
+    second = RouteStore(path)
+    try:
+        assert second.get_many([ROUTE]) == [1260]
+    finally:
+        second.close()
+
+def test_path_defaults_to_route_cache_path(tmp_path, monkeypatch):
+    path = tmp_path / "nested" / "routes.db"
+    monkeypatch.setenv("ROUTE_CACHE_PATH", str(path))
+    
+    RouteStore().close()
+    
+    assert path.exists()
@@ -5,13 +5,15 @@ Each test builds upon the results of previous tests.
 """
 
 import os
-import json
+import asyncio
+import httpx
+import orjson
 from datetime import datetime
 import sys
 from pathlib import Path
 import time
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
+from types import SimpleNamespace
+from typing import Dict, Any, List, Optional
 import logging
 import pytest
 from fastapi.testclient import TestClient
@@ -21,7 +23,9 @@ from fastapi import FastAPI
 project_root = str(Path(__file__).parent.parent)
 sys.path.append(project_root)
 
-from backend.api.routes import router
+from backend.api.routes import MAX_BATCH_URLS, get_service_manager, router
+from backend.services.map import DistanceCalculator
+from backend.services.scraper import DomainScraper
 
 # Configure logging
 logging.basicConfig(
@@ -30,49 +34,123 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv(project_root + '/config/.env')
-
 # Test configuration
 TEST_PROPERTY_URL = "https://www.domain.com.au/1-henry-kendall-crescent-mascot-nsw-2020-2019711647"
 TEST_RESULTS_DIR = Path(project_root) / "test_results"
-TEST_RUN_DIR = TEST_RESULTS_DIR / f"test_routes_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+# Shared by every module and worker in a pytest run (see conftest.py)
+TEST_RUN_ID = os.getenv("TEST_RUN_ID") or datetime.now().strftime('%Y%m%d_%H%M%S')
+TEST_RUN_DIR = TEST_RESULTS_DIR / f"test_routes_{TEST_RUN_ID}"
+
+# Request bodies are encoded once and posted as raw JSON
+JSON_HEADERS = {"content-type": "application/json"}
+VALID_INIT_PAYLOAD = orjson.dumps({"url": TEST_PROPERTY_URL})
+INVALID_URL_PAYLOAD = orjson.dumps({
+    "url": "https://invalid-domain.com.au/invalid-property",
+    "categories": ["school", "train", "shopping"]
+})
+MISSING_URL_PAYLOAD = orjson.dumps({"categories": ["school", "train", "shopping"]})
+ANALYSIS_PAYLOAD = orjson.dumps({
+    "property_data": {"address": {"full_address": "1 Henry Kendall Crescent, Mascot NSW 2020"}},
+    "agent": "negative_nancy"
+})
+
+# Set LOG_HEADERS=1 to include response headers in responses.ndjson
+LOG_HEADERS = bool(os.getenv("LOG_HEADERS"))
+
+# Recorded external responses for TEST_PROPERTY_URL, replayed by the route tests
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+# Test result JSON is compact unless pytest runs with --pretty-artifacts (see conftest.py)
+ARTIFACT_JSON_OPTION = orjson.OPT_INDENT_2 if os.getenv("PRETTY_ARTIFACTS") else 0
 
 # Create test results directory
 TEST_RUN_DIR.mkdir(parents=True, exist_ok=True)
 
-# Configure file logging
-file_handler = logging.FileHandler(TEST_RUN_DIR / "test_routes.log")
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-logger.addHandler(file_handler)
-
 def save_test_data(data: Dict[str, Any], filename: str) -> None:
     """Save test data to a JSON file."""
     filepath = TEST_RUN_DIR / filename
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
-    logger.info(f"Saved test data to {filepath}")
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(data, option=ARTIFACT_JSON_OPTION))
+    logger.info("Saved test data to %s", filepath)
 
-def save_api_response(response: Any, test_name: str) -> None:
+def save_api_response(test_state: "StateManager", response: Any, test_name: str) -> None:
     """
-    Save API response data to a JSON file.
+    Record API response data, written to responses.ndjson when the test session ends.
     
     Args:
+        test_state: The shared test state holding the response log
         response: The API response object
-        test_name: Name of the test for the filename
+        test_name: Name of the test the response belongs to
     """
     response_data = {
+        "name": test_name,
         "status_code": response.status_code,
-        "headers": dict(response.headers),
-        "body": response.json() if response.status_code != 422 else None,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now()
     }
     
+    # No test asserts on headers, so they are only recorded on request
+    if LOG_HEADERS:
+        response_data["headers"] = dict(response.headers)
+    
     # Handle validation errors (422)
-    if response.status_code == 422:
-        response_data["validation_error"] = response.json()
+    body_field = b"validation_error" if response.status_code == 422 else b"body"
+    
+    # Compact JSON bodies are spliced into the record as is instead of being decoded and
+    # re-encoded. JSON spanning several lines is re-encoded so the record stays on one line,
+    # and any other body is stored as a JSON string.
+    body = response.content
+    if not (body and response.headers.get("content-type", "").startswith("application/json")):
+        body = orjson.dumps(response.text)
+    elif b"\n" in body or b"\r" in body:
+        try:
+            body = orjson.dumps(orjson.loads(body))
+        except orjson.JSONDecodeError:
+            body = orjson.dumps(response.text)
+    record = orjson.dumps(response_data)
+    test_state.response_log.append(b"%s,\"%s\":%s}" % (record[:-1], body_field, body))
+
+def _recorded(method, filename: str, record: bool):
+    """
+    Wrap an async service method so its result is replayed from FIXTURES_DIR, or called
+    live and recorded there when record is set.
+    """
+    path = FIXTURES_DIR / filename
     
-    save_test_data(response_data, f"{test_name}_response.json")
+    async def replay(self, *args, **kwargs):
+        if not record:
+            if not path.exists():
+                pytest.fail(
+                    f"Missing recording {path}; run pytest with --record-external to capture it "
+                    "from the live services, or --no-mock-external to call them directly"
+                )
+            return orjson.loads(path.read_bytes())
+        result = await method(self, *args, **kwargs)
+        if result:
+            FIXTURES_DIR.mkdir(exist_ok=True)
+            path.write_bytes(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+            logger.info("Recorded external response to %s", path)
+        return result
+    return replay
+
+@pytest.fixture(scope="module", autouse=True)
+def recorded_external_calls(request):
+    """
+    Replay the recorded listing, gallery and distance responses in tests/fixtures so the
+    route tests do not depend on the network. Pass --record-external to refresh the
+    recordings from the live services, or --no-mock-external to always call them.
+    """
+    if request.config.getoption("--no-mock-external"):
+        yield
+        return
+    record = request.config.getoption("--record-external")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(DomainScraper, "fetch_listing", _recorded(DomainScraper.fetch_listing, "listing.json", record))
+        mp.setattr(DomainScraper, "get_images", _recorded(DomainScraper.get_images, "images.json", record))
+        mp.setattr(
+            DistanceCalculator,
+            "calculate_distances",
+            _recorded(DistanceCalculator.calculate_distances, "distances.json", record)
+        )
+        yield
 
 class StateManager:
     """Class to maintain state between tests."""
@@ -82,22 +160,38 @@ class StateManager:
         self.session_id: Optional[str] = None
         self.property_data: Optional[Dict[str, Any]] = None
         self.distance_info: Optional[Dict[str, Any]] = None
+        # One JSON line per recorded API response
+        self.response_log: List[bytes] = []
 
 @pytest.fixture(scope="session")
 def test_state():
-    """Create a test state object to share between tests."""
-    return StateManager()
+    """Create a test state object to share between tests, saving the API responses at the end."""
+    state = StateManager()
+    yield state
+    if state.response_log:
+        filepath = TEST_RUN_DIR / "responses.ndjson"
+        filepath.write_bytes(b"".join(entry + b"\n" for entry in state.response_log))
+        logger.info("Saved API responses to %s", filepath)
 
-def test_01_environment_setup(test_state):
+@pytest.fixture(scope="session")
+def initialized_session(test_state):
+    """Initialize the test property once and share the response between tests."""
+    if not test_state.client:
+        raise ValueError("Test client not available from previous test")
+    
+    response = test_state.client.post(
+        "/api/v1/initialize",
+        content=VALID_INIT_PAYLOAD,
+        headers=JSON_HEADERS
+    )
+    save_api_response(test_state, response, "03_property_initialization")
+    return response
+
+def test_01_environment_setup(test_state, env):
     """Test that all required environment variables are set."""
     logger.info("Testing environment setup...")
     
-    required_vars = {
-        "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY"),
-        "GOOGLE_MAP_API_KEY": os.getenv("GOOGLE_MAP_API_KEY")
-    }
-    
-    missing_vars = [var for var, value in required_vars.items() if not value]
+    missing_vars = [var for var, value in env.items() if not value]
     if missing_vars:
         raise ValueError(f"Missing required environment variables: {', '.join(missing_vars)}")
     
@@ -115,7 +209,7 @@ def test_02_fastapi_setup(test_state):
         
         # Test that the app is running
         response = test_state.client.get("/api/v1/")
-        save_api_response(response, "02_fastapi_setup")
+        save_api_response(test_state, response, "02_fastapi_setup")
         
         assert response.status_code == 200
         assert response.json() == {"message": "Root endpoint"}
@@ -123,26 +217,16 @@ def test_02_fastapi_setup(test_state):
         logger.info("✓ FastAPI setup successful")
         
     except Exception as e:
-        logger.error(f"FastAPI setup failed: {str(e)}")
+        logger.exception("FastAPI setup failed: %s", e)
         raise
 
-def test_03_property_initialization(test_state):
+def test_03_property_initialization(test_state, initialized_session):
     """Test property initialization endpoint."""
     logger.info("Testing property initialization endpoint...")
     
-    if not test_state.client:
-        raise ValueError("Test client not available from previous test")
-    
     try:
         # Test with valid URL
-        response = test_state.client.post(
-            "/api/v1/initialize",
-            json={
-                "url": TEST_PROPERTY_URL,
-            }
-        )
-        
-        save_api_response(response, "03_property_initialization")
+        response = initialized_session
         
         assert response.status_code == 200
         data = response.json()
@@ -158,99 +242,158 @@ def test_03_property_initialization(test_state):
         logger.info("✓ Property initialization test successful")
         
     except Exception as e:
-        logger.error(f"Property initialization test failed: {str(e)}")
+        logger.exception("Property initialization test failed: %s", e)
         raise
 
-def test_04_invalid_url(test_state):
-    """Test property initialization with invalid URL."""
-    logger.info("Testing invalid URL handling...")
+def test_04_invalid_requests(test_state):
+    """Test property initialization with an invalid URL and with a missing URL, sent concurrently."""
+    logger.info("Testing invalid and missing URL handling...")
     
-    if not test_state.client:
-        raise ValueError("Test client not available from previous test")
+    if not test_state.app:
+        raise ValueError("FastAPI app not available from previous test")
+    
+    async def post_all(payloads):
+        # The requests are independent, so they are handled concurrently by the app
+        transport = httpx.ASGITransport(app=test_state.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await asyncio.gather(*(
+                client.post("/api/v1/initialize", content=payload, headers=JSON_HEADERS)
+                for payload in payloads
+            ))
     
     try:
-        # Test with invalid URL
-        response = test_state.client.post(
-            "/api/v1/initialize",
-            json={
-                "url": "https://invalid-domain.com.au/invalid-property",
-                "categories": ["school", "train", "shopping"]
-            }
+        invalid_response, missing_response = asyncio.run(
+            post_all([INVALID_URL_PAYLOAD, MISSING_URL_PAYLOAD])
         )
         
-        save_api_response(response, "04_invalid_url")
+        save_api_response(test_state, invalid_response, "04_invalid_url")
+        save_api_response(test_state, missing_response, "04_missing_url")
         
-        # Should still return 200 but with error status
-        assert response.status_code == 200
-        data = response.json()
+        # Invalid URL should still return 200 but with error status
+        assert invalid_response.status_code == 200
+        data = invalid_response.json()
         
         # Verify error handling
         assert "session_id" in data
         assert "status" in data
         assert data["status"] == "error"  # Initial status is still not created
         
-        logger.info("✓ Invalid URL test successful")
+        # Missing URL should return 422 (Validation Error)
+        assert missing_response.status_code == 422
+        
+        logger.info("✓ Invalid and missing URL tests successful")
         
     except Exception as e:
-        logger.error(f"Invalid URL test failed: {str(e)}")
+        logger.exception("Invalid request tests failed: %s", e)
         raise
 
-def test_05_missing_url(test_state):
-    """Test property initialization with missing URL."""
-    logger.info("Testing missing URL handling...")
+def test_05_service_manager_initialization(test_state, initialized_session):
+    """Test service manager initialization and lazy loading."""
+    logger.info("Testing service manager initialization...")
     
     if not test_state.client:
         raise ValueError("Test client not available from previous test")
     
     try:
-        # Test with missing URL
+        assert initialized_session.json()["status"] == "ready"
+        
+        # The initialization request created the services once, on a single shared manager
+        service_manager = get_service_manager()
+        assert get_service_manager() is service_manager
+        assert service_manager.scraper is service_manager.scraper
+        assert service_manager.distance_calculator is service_manager.distance_calculator
+        
+        # The session is readable without initializing the property again
+        response = test_state.client.get(f"/api/v1/sessions/{test_state.session_id}")
+        
+        save_api_response(test_state, response, "05_service_manager")
+        
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        
+        logger.info("✓ Service manager initialization test successful")
+        
+    except Exception as e:
+        logger.exception("Service manager initialization test failed: %s", e)
+        raise
+
+class StreamingModel:
+    """Stands in for the Gemini model, streaming a fenced JSON analysis in uneven chunks."""
+    CHUNKS = ["```js", "on\n{\"summary\": ", None, "\"Too close to the airport\"}\n``", "`"]
+    
+    def generate_content(self, prompt, stream=False):
+        for text in self.CHUNKS:
+            # Chunks without text (e.g. finish-only chunks) have no content parts
+            parts = [SimpleNamespace(text=text)] if text is not None else []
+            yield SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=parts))])
+
+def test_06_analyze_stream(test_state, monkeypatch):
+    """Test that the streamed analysis is the agent's JSON without markdown fences."""
+    logger.info("Testing streamed analysis...")
+    
+    if not test_state.client:
+        raise ValueError("Test client not available from previous test")
+    
+    try:
+        monkeypatch.setattr(get_service_manager().negative_nancy, "model", StreamingModel())
         response = test_state.client.post(
-            "/api/v1/initialize",
-            json={
-                "categories": ["school", "train", "shopping"]
-            }
+            "/api/v1/analyze/stream",
+            content=ANALYSIS_PAYLOAD,
+            headers=JSON_HEADERS
         )
         
-        save_api_response(response, "05_missing_url")
+        save_api_response(test_state, response, "06_analyze_stream")
         
-        # Should return 422 (Validation Error)
-        assert response.status_code == 422
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert orjson.loads(response.content) == {"summary": "Too close to the airport"}
         
-        logger.info("✓ Missing URL test successful")
+        logger.info("✓ Streamed analysis test successful")
         
     except Exception as e:
-        logger.error(f"Missing URL test failed: {str(e)}")
+        logger.exception("Streamed analysis test failed: %s", e)
         raise
 
-def test_06_service_manager_initialization(test_state):
-    """Test service manager initialization and lazy loading."""
-    logger.info("Testing service manager initialization...")
+def test_07_batch_initialization(test_state):
+    """Test batch initialization: request order, per-URL errors, repeated URLs and batch size limits."""
+    logger.info("Testing batch initialization...")
     
     if not test_state.client:
         raise ValueError("Test client not available from previous test")
     
     try:
-        # Make a request to trigger service initialization
+        invalid_url = "https://invalid-domain.com.au/invalid-property"
         response = test_state.client.post(
-            "/api/v1/initialize",
-            json={
-                "url": TEST_PROPERTY_URL,
-            }
+            "/api/v1/initialize/batch",
+            content=orjson.dumps({"urls": [TEST_PROPERTY_URL, invalid_url, TEST_PROPERTY_URL]}),
+            headers=JSON_HEADERS
         )
         
-        save_api_response(response, "06_service_manager")
+        save_api_response(test_state, response, "07_batch_initialization")
         
         assert response.status_code == 200
-        data = response.json()
+        results = response.json()["results"]
         
-        # Verify new session was created
-        assert "session_id" in data
-        assert data["session_id"] != test_state.session_id  # Should be different from previous session
+        # One result per requested URL, in request order, with the invalid URL failing on its own
+        assert [result["status"] for result in results] == ["ready", "error", "ready"]
+        assert results[0]["property_data"]["basic_info"]["url"] == TEST_PROPERTY_URL
         
-        logger.info("✓ Service manager initialization test successful")
+        # The repeated URL was initialized once
+        assert results[0]["session_id"] == results[2]["session_id"]
+        
+        # Empty and oversized batches are rejected
+        for urls in ([], [TEST_PROPERTY_URL] * (MAX_BATCH_URLS + 1)):
+            response = test_state.client.post(
+                "/api/v1/initialize/batch",
+                content=orjson.dumps({"urls": urls}),
+                headers=JSON_HEADERS
+            )
+            assert response.status_code == 422
+        
+        logger.info("✓ Batch initialization test successful")
         
     except Exception as e:
-        logger.error(f"Service manager initialization test failed: {str(e)}")
+        logger.exception("Batch initialization test failed: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -1,21 +1,18 @@
+import asyncio
 import os
-import json
+import orjson
 from datetime import datetime
 import sys
 from pathlib import Path
 import time
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv
 import logging
-
-
+import pytest
 
 # Add the project root directory to the Python path
 project_root = str(Path(__file__).parent.parent)
 sys.path.append(project_root)
 
-from backend.services.scraper import DomainScraper
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,42 +20,146 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv(project_root + '/config/.env')
+from backend.services.scraper import DomainScraper
 
 # Test configuration
 TEST_PROPERTY_URL = "https://www.domain.com.au/838-6-etherden-walk-mascot-nsw-2020-2019867596"
 TEST_RESULTS_DIR = Path(project_root) / "test_results"
-TEST_RUN_DIR = TEST_RESULTS_DIR / f"test_run_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+# Shared by every module and worker in a pytest run (see conftest.py)
+TEST_RUN_ID = os.getenv("TEST_RUN_ID") or datetime.now().strftime('%Y%m%d_%H%M%S')
+TEST_RUN_DIR = TEST_RESULTS_DIR / f"test_run_{TEST_RUN_ID}"
+# Test result JSON is compact unless pytest runs with --pretty-artifacts (see conftest.py)
+ARTIFACT_JSON_OPTION = orjson.OPT_INDENT_2 if os.getenv("PRETTY_ARTIFACTS") else 0
 
 # Create test results directory
 TEST_RUN_DIR.mkdir(parents=True, exist_ok=True)
 
-# Configure file logging
-file_handler = logging.FileHandler(TEST_RUN_DIR / "test_agent.log")
-file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-logger.addHandler(file_handler)
-
 def save_test_data(data: Dict[str, Any], filename: str) -> None:
     """Save test data to a JSON file."""
     filepath = TEST_RUN_DIR / filename
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
-    logger.info(f"Saved test data to {filepath}")
+    with open(filepath, 'wb') as f:
+        f.write(orjson.dumps(data, option=ARTIFACT_JSON_OPTION))
+    logger.info("Saved test data to %s", filepath)
 
-if __name__ == "__main__":
+def test_domain_scraper(domain_scraper, session_loop):
+    """Test the Domain scraper with the test property URL."""
+    logger.info("Testing Domain scraper...")
+    
     try:
-        scraper = DomainScraper()
-        property_data = scraper.get_property_data(TEST_PROPERTY_URL)
+        property_data = session_loop.run_until_complete(domain_scraper.get_property_data(TEST_PROPERTY_URL))
         
         if not property_data:
             raise ValueError("Failed to fetch property data")
         
-        property_data = property_data
         logger.info("✓ Domain scraper test successful")
         save_test_data(property_data, "02_domain_scraper.json")
         
     except Exception as e:
-        logger.error(f"Domain scraper test failed: {str(e)}")
+        logger.exception("Domain scraper test failed: %s", e)
         raise
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+# Listing page without __NEXT_DATA__, so every field comes from the DOM
+DOM_LISTING_HTML = """<html><body>
+<h1 data-testid="listing-details__button-copy-link">2 Coward Street, Mascot NSW 2020</h1>
+<div data-testid="listing-details__summary-title">Offers over $1,250,000</div>
+<div data-testid="listing-summary-property-type">Apartment</div>
+<span>2</span><span>Beds</span><span>1</span><span>Bath</span><span>1</span><span>Parking</span>
+<div data-testid="listing-details__floor-area">85.5m²</div>
+<div data-testid="listing-details__description">Close to the station...</div>
+</body></html>"""
+
+@pytest.fixture
+def scraper():
+    """A scraper for offline parsing tests; no requests are made and Selenium is never started."""
+    scraper = DomainScraper()
+    yield scraper
+    asyncio.run(scraper.close())
+
+@pytest.fixture(scope="module")
+def listing_html() -> str:
+    """Recorded listing page with its __NEXT_DATA__ payload."""
+    return orjson.loads((FIXTURES_DIR / "listing.json").read_bytes())
+
+def test_parse_listing_from_next_data(scraper, listing_html):
+    property_data, complete_description = scraper._parse_listing(TEST_PROPERTY_URL, listing_html)
+
+    assert complete_description
+    assert property_data["basic_info"] == {
+        "url": TEST_PROPERTY_URL,
+        "title": "Light-filled family home moments from Mascot Station",
+        "property_type": "House",
+        # The listing is for auction, so it has no price
+        "price": None,
+    }
+    assert property_data["address"] == {"full_address": "1 Henry Kendall Crescent, Mascot NSW 2020"}
+    assert property_data["features"] == {
+        "bedrooms": 3,
+        "bathrooms": 2,
+        "parking": 1,
+        "property_size": 168.0,
+        "land_size": 310.0,
+    }
+    assert property_data["description"].startswith("Set on a quiet crescent")
+    assert property_data["description"].count("\n") == 2
+    assert property_data["agent_details"] == {"agency_name": "Mascot Realty", "agent_name": "Sam Taylor"}
+    assert property_data["inspection_times"] == ["Saturday 10:00am - 10:30am"]
+    assert property_data["images"] == []
+
+def test_parse_listing_gallery_from_next_data(scraper):
+    next_data = {"props": {"pageProps": {"componentProps": {"gallery": {"slides": [
+        {"mediaType": "image", "images": {"original": {"url": "https://example.com/1.jpg"}}},
+        {"mediaType": "video", "images": {"original": {"url": "https://example.com/video.jpg"}}},
+        {"images": {"original": {"url": "https://example.com/2.jpg"}}},
+        {"mediaType": "image", "images": {"original": {"url": "https://example.com/1.jpg"}}},
+    ]}}}}}
+
+    assert scraper._get_images_from_next_data(next_data) == ["https://example.com/1.jpg", "https://example.com/2.jpg"]
+
+def test_parse_listing_from_dom(scraper):
+    property_data, complete_description = scraper._parse_listing(TEST_PROPERTY_URL, DOM_LISTING_HTML)
+
+    # The DOM description may be cut off behind "Read more"
+    assert not complete_description
+    assert property_data["basic_info"]["price"] == 1250000
+    assert property_data["basic_info"]["property_type"] == "Apartment"
+    assert property_data["address"]["full_address"] == "2 Coward Street, Mascot NSW 2020"
+    assert property_data["features"]["bedrooms"] == 2
+    assert property_data["features"]["bathrooms"] == 1
+    assert property_data["features"]["parking"] == 1
+    assert property_data["features"]["property_size"] == 85.5
+    assert property_data["features"]["land_size"] is None
+    assert property_data["description"] == "Close to the station..."
+
+def test_parse_listing_expands_dom_description(scraper, monkeypatch):
+    expanded = []
+
+    def expand_description(url):
+        expanded.append(url)
+        return "Close to the station and shops."
+
+    monkeypatch.setattr(scraper, "_expand_description", expand_description)
+    property_data = asyncio.run(scraper.parse_listing(TEST_PROPERTY_URL, DOM_LISTING_HTML))
+
+    assert expanded == [TEST_PROPERTY_URL]
+    assert property_data["description"] == "Close to the station and shops."
+
+def test_quick_address(scraper, listing_html):
+    assert scraper.quick_address(listing_html) == "1 Henry Kendall Crescent, Mascot NSW 2020"
+    assert scraper.quick_address(DOM_LISTING_HTML) is None
+
+@pytest.mark.parametrize("price_text, expected", [
+    ("$1,500,000", 1500000),
+    ("Offers over $1,250,000", 1250000),
+    ("$950,000.50", 950000),
+    ("$1,100,000 - $1,200,000", 1100000),
+    ("Price guide $ 800,000", 800000),
+    ("Auction", None),
+    ("Contact agent", None),
+    ("", None),
+])
+def test_clean_price(scraper, price_text, expected):
+    assert scraper._clean_price(price_text) == expected
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])